@@ -0,0 +1,114 @@
+"""
+Korean Date Utilities Tests
+
+Tests for:
+- Korean date parsing (parse_korean_date)
+- Korean date formatting (format_korean_date)
+- Fiscal year, quarter and VAT period helpers
+"""
+from datetime import date, datetime
+
+import pytest
+from shared.utils.date_utils import (
+    format_korean_date,
+    get_korean_fiscal_quarter,
+    get_korean_fiscal_year,
+    get_vat_period,
+    parse_korean_date,
+)
+
+
+class TestParseKoreanDate:
+    """Test parsing of supported Korean date formats."""
+
+    # ========================================================================
+    # Supported Format Tests
+    # ========================================================================
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "2026-01-15",
+            "2026/01/15",
+            "2026.01.15",
+            "20260115",
+            "2026년 01월 15일",
+            "2026년1월15일",
+            "  2026-1-15  ",
+        ],
+    )
+    def test_supported_formats(self, value):
+        """Test every supported format parses to the same date."""
+        assert parse_korean_date(value) == date(2026, 1, 15)
+
+    # ========================================================================
+    # Invalid Format Tests
+    # ========================================================================
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "",
+            "2026-01/15",
+            "2026-001-15",
+            "26-01-15",
+            "2026011",
+            "2026-02-30",
+            "2026년 01월 15",
+            "15/01/2026",
+            "Jan 15 2026",
+        ],
+    )
+    def test_unrecognized_formats_raise_error(self, value):
+        """Test that malformed or impossible dates raise ValueError."""
+        with pytest.raises(ValueError, match="Unrecognized date format"):
+            parse_korean_date(value)
+
+
+class TestFormatKoreanDate:
+    """Test date formatting styles."""
+
+    @pytest.mark.parametrize(
+        "fmt,expected",
+        [
+            ("standard", "2026-01-05"),
+            ("compact", "20260105"),
+            ("korean", "2026년 01월 05일"),
+            ("slash", "2026/01/05"),
+            ("dot", "2026.01.05"),
+        ],
+    )
+    def test_format_styles(self, fmt, expected):
+        """Test each supported format style."""
+        assert format_korean_date(date(2026, 1, 5), fmt) == expected
+
+    def test_format_datetime(self):
+        """Test datetime input is formatted by its date part."""
+        assert format_korean_date(datetime(2026, 1, 5, 13, 30)) == "2026-01-05"
+
+    def test_unknown_format_raises_error(self):
+        """Test that an unknown style raises ValueError."""
+        with pytest.raises(ValueError, match="Unknown format"):
+            format_korean_date(date(2026, 1, 5), "iso")
+
+
+class TestFiscalPeriods:
+    """Test fiscal year, quarter and VAT period helpers."""
+
+    @pytest.mark.parametrize(
+        "month,quarter,vat_period",
+        [(1, 1, 1), (3, 1, 1), (4, 2, 1), (6, 2, 1), (7, 3, 2), (9, 3, 2), (10, 4, 2), (12, 4, 2)],
+    )
+    def test_period_boundaries(self, month, quarter, vat_period):
+        """Test quarter and VAT period at month boundaries."""
+        d = date(2026, month, 1)
+        assert get_korean_fiscal_year(d) == 2026
+        assert get_korean_fiscal_quarter(d) == quarter
+        assert get_vat_period(d) == (2026, vat_period)
+
+    def test_datetime_matches_date(self):
+        """Test datetime input gives the same result as its date."""
+        dt = datetime(2026, 8, 31, 23, 59)
+        assert get_korean_fiscal_year(dt) == 2026
+        assert get_korean_fiscal_quarter(dt) == 3
+        assert get_vat_period(dt) == get_vat_period(dt.date()) == (2026, 2)
@@ -62,6 +62,10 @@ class TestValidateBusinessNumber:
         assert validate_business_number("12345678ab") is False
         assert validate_business_number("abcdefghij") is False
 
+    def test_invalid_non_ascii_digits(self):
+        """Test business number with full-width (non-ASCII) digits."""
+        assert validate_business_number("１２３４５６７８９１") is False
+
     def test_invalid_check_digit(self):
         """Test business number with wrong check digit."""
         # 1234567890 - last digit should not be 0 for this prefix
@@ -2,8 +2,15 @@
 Korean date format utilities.
 """
 from datetime import datetime, date
+from functools import cache
+from itertools import groupby
 from typing import Union
-import re
+
+_DATE_SEPARATORS = frozenset("-/.")
+_DATE_FORMATS = ("standard", "compact", "korean", "slash", "dot")
+
+# Fiscal quarter indexed by month (index 0 unused)
+_FISCAL_QUARTERS = (0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4)
 
 
 def parse_korean_date(date_str: str) -> date:
@@ -29,27 +36,36 @@ def parse_korean_date(date_str: str) -> date:
     # Remove extra whitespace
     date_str = date_str.strip()
 
-    # Try standard formats
-    patterns = [
-        (r"^(\d{4})-(\d{1,2})-(\d{1,2})$", "%Y-%m-%d"),
-        (r"^(\d{4})/(\d{1,2})/(\d{1,2})$", "%Y/%m/%d"),
-        (r"^(\d{4})\.(\d{1,2})\.(\d{1,2})$", "%Y.%m.%d"),
-        (r"^(\d{8})$", "%Y%m%d"),
-    ]
-
-    for pattern, fmt in patterns:
-        if re.match(pattern, date_str):
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-
-    # Try Korean format (YYYY년 MM월 DD일)
-    korean_pattern = r"^(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일$"
-    match = re.match(korean_pattern, date_str)
-    if match:
-        year, month, day = map(int, match.groups())
-        return date(year, month, day)
+    # Split once into alternating digit / separator runs
+    if not date_str[:1].isdigit():
+        raise ValueError(f"Unrecognized date format: {date_str}")
+    tokens = ["".join(run) for _, run in groupby(date_str, str.isdigit)]
+
+    try:
+        if len(tokens) == 1 and len(date_str) == 8:
+            # YYYYMMDD
+            return date(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:]))
+
+        if len(tokens) == 5 and tokens[1] == tokens[3] and tokens[1] in _DATE_SEPARATORS:
+            # YYYY-MM-DD, YYYY/MM/DD, YYYY.MM.DD
+            year, _, month, _, day = tokens
+            if len(year) == 4 and len(month) <= 2 and len(day) <= 2:
+                return date(int(year), int(month), int(day))
+
+        if (
+            len(tokens) == 6
+            and tokens[5] == "일"
+            and tokens[1][:1] == "년"
+            and tokens[3][:1] == "월"
+            and not tokens[1][1:].strip()
+            and not tokens[3][1:].strip()
+        ):
+            # YYYY년 MM월 DD일
+            year, _, month, _, day, _ = tokens
+            if len(year) == 4 and len(month) <= 2 and len(day) <= 2:
+                return date(int(year), int(month), int(day))
+    except ValueError:
+        pass
 
     raise ValueError(f"Unrecognized date format: {date_str}")
 
@@ -76,18 +92,18 @@ def format_korean_date(
     if isinstance(d, datetime):
         d = d.date()
 
-    formats = {
-        "standard": d.strftime("%Y-%m-%d"),
-        "compact": d.strftime("%Y%m%d"),
-        "korean": f"{d.year}년 {d.month:02d}월 {d.day:02d}일",
-        "slash": d.strftime("%Y/%m/%d"),
-        "dot": d.strftime("%Y.%m.%d"),
-    }
-
-    if fmt not in formats:
-        raise ValueError(f"Unknown format: {fmt}. Use one of: {list(formats.keys())}")
+    if fmt == "standard":
+        return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+    if fmt == "compact":
+        return f"{d.year:04d}{d.month:02d}{d.day:02d}"
+    if fmt == "korean":
+        return f"{d.year}년 {d.month:02d}월 {d.day:02d}일"
+    if fmt == "slash":
+        return f"{d.year:04d}/{d.month:02d}/{d.day:02d}"
+    if fmt == "dot":
+        return f"{d.year:04d}.{d.month:02d}.{d.day:02d}"
 
-    return formats[fmt]
+    raise ValueError(f"Unknown format: {fmt}. Use one of: {list(_DATE_FORMATS)}")
 
 
 def get_korean_fiscal_year(d: Union[date, datetime]) -> int:
@@ -102,8 +118,6 @@ def get_korean_fiscal_year(d: Union[date, datetime]) -> int:
     Returns:
         Fiscal year (YYYY)
     """
-    if isinstance(d, datetime):
-        d = d.date()
     return d.year
 
 
@@ -117,9 +131,7 @@ def get_korean_fiscal_quarter(d: Union[date, datetime]) -> int:
     Returns:
         Quarter number (1-4)
     """
-    if isinstance(d, datetime):
-        d = d.date()
-    return (d.month - 1) // 3 + 1
+    return _FISCAL_QUARTERS[d.month]
 
 
 def get_vat_period(d: Union[date, datetime]) -> tuple[int, int]:
@@ -136,8 +148,11 @@ def get_vat_period(d: Union[date, datetime]) -> tuple[int, int]:
     Returns:
         Tuple of (year, period) where period is 1 or 2
     """
-    if isinstance(d, datetime):
-        d = d.date()
+    return _vat_period(d.year, d.month)
+
 
-    period = 1 if d.month <= 6 else 2
-    return d.year, period
+@cache
+def _vat_period(year: int, month: int) -> tuple[int, int]:
+    """Return the (year, period) tuple for a month, shared across calls."""
+    period = 1 if month <= 6 else 2
+    return year, period
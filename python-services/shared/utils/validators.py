@@ -1,7 +1,12 @@
 """
 Korean business document validators.
 """
-import re
+
+# Maps ASCII digit bytes to their values so indexing yields ints directly
+_DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+# Maps a digit value d to the digit sum of 2 * d (e.g. 7 -> 14 -> 5)
+_DOUBLED_DIGIT_SUMS = bytes.maketrans(bytes(range(10)), bytes((0, 2, 4, 6, 8, 1, 3, 5, 7, 9)))
 
 
 def validate_business_number(number: str) -> bool:
@@ -18,18 +23,22 @@ def validate_business_number(number: str) -> bool:
         True if valid, False otherwise
     """
     # Remove dashes and whitespace
-    cleaned = re.sub(r"[-\s]", "", number)
+    cleaned = "".join(number.replace("-", "").split())
 
     # Must be exactly 10 digits
-    if not cleaned.isdigit() or len(cleaned) != 10:
+    if len(cleaned) != 10 or not (cleaned.isascii() and cleaned.isdigit()):
         return False
 
     # Check digit validation algorithm
-    weights = [1, 3, 7, 1, 3, 7, 1, 3, 5]
-    digits = [int(d) for d in cleaned]
-
-    checksum = sum(w * d for w, d in zip(weights, digits[:9]))
-    checksum += (weights[8] * digits[8]) // 10
+    digits = cleaned.encode("ascii").translate(_DIGIT_VALUES)
+
+    # Weights: 1, 3, 7, 1, 3, 7, 1, 3, 5 (unrolled)
+    checksum = (
+        digits[0] + 3 * digits[1] + 7 * digits[2]
+        + digits[3] + 3 * digits[4] + 7 * digits[5]
+        + digits[6] + 3 * digits[7] + 5 * digits[8]
+    )
+    checksum += (5 * digits[8]) // 10
     remainder = checksum % 10
     check_digit = (10 - remainder) % 10
 
@@ -49,7 +58,7 @@ def format_business_number(number: str) -> str:
     Raises:
         ValueError: If number is not valid
     """
-    cleaned = re.sub(r"[-\s]", "", number)
+    cleaned = "".join(number.replace("-", "").split())
 
     if not validate_business_number(cleaned):
         raise ValueError(f"Invalid business number: {number}")
@@ -70,17 +79,21 @@ def validate_resident_number(number: str) -> bool:
         True if valid, False otherwise
     """
     # Remove dash and whitespace
-    cleaned = re.sub(r"[-\s]", "", number)
+    cleaned = "".join(number.replace("-", "").split())
 
     # Must be exactly 13 digits
-    if not cleaned.isdigit() or len(cleaned) != 13:
+    if len(cleaned) != 13 or not (cleaned.isascii() and cleaned.isdigit()):
         return False
 
     # Check digit validation
-    weights = [2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5]
-    digits = [int(d) for d in cleaned]
-
-    checksum = sum(w * d for w, d in zip(weights, digits[:12]))
+    digits = cleaned.encode("ascii").translate(_DIGIT_VALUES)
+
+    # Weights: 2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5 (unrolled)
+    checksum = (
+        2 * digits[0] + 3 * digits[1] + 4 * digits[2] + 5 * digits[3]
+        + 6 * digits[4] + 7 * digits[5] + 8 * digits[6] + 9 * digits[7]
+        + 2 * digits[8] + 3 * digits[9] + 4 * digits[10] + 5 * digits[11]
+    )
     check_digit = (11 - (checksum % 11)) % 10
 
     return check_digit == digits[12]
@@ -97,20 +110,17 @@ def validate_corporate_number(number: str) -> bool:
         True if valid, False otherwise
     """
     # Remove dash and whitespace
-    cleaned = re.sub(r"[-\s]", "", number)
+    cleaned = "".join(number.replace("-", "").split())
 
     # Must be exactly 13 digits
-    if not cleaned.isdigit() or len(cleaned) != 13:
+    if len(cleaned) != 13 or not (cleaned.isascii() and cleaned.isdigit()):
         return False
 
     # Check digit validation
-    weights = [1, 2, 1, 2, 1, 2, 1, 2, 1, 2, 1, 2]
-    digits = [int(d) for d in cleaned]
+    digits = cleaned.encode("ascii").translate(_DIGIT_VALUES)
 
-    checksum = 0
-    for w, d in zip(weights, digits[:12]):
-        product = w * d
-        checksum += product // 10 + product % 10
+    # Weights alternate 1, 2; each product contributes its digit sum
+    checksum = sum(digits[0:12:2]) + sum(digits[1:12:2].translate(_DOUBLED_DIGIT_SUMS))
 
     check_digit = (10 - (checksum % 10)) % 10
 
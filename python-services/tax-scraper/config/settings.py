@@ -4,10 +4,10 @@ Tax Scraper Service Configuration
 Loads configuration from environment variables with sensible defaults.
 """
 
-from functools import lru_cache
+from functools import cached_property
 from typing import Optional
 
-from pydantic import Field
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -19,6 +19,7 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        frozen=True,
     )
 
     # Service
@@ -40,10 +41,15 @@ class Settings(BaseSettings):
     hometax_retry_delay: float = 1.0
 
     # Browser (Playwright)
-    browser_headless: bool = True
+    browser_headless: bool = Field(
+        default=True,
+        validation_alias=AliasChoices("BROWSER_HEADLESS", "PLAYWRIGHT_HEADLESS"),
+    )
     browser_slow_mo: int = 0
     browser_timeout: int = 30000
-    playwright_headless: bool = True  # Alias for backward compatibility
+    # Concurrent browser contexts; bounds in-flight Hometax operations. Each
+    # pre-warmed context holds roughly 300 MB, so size it to the container.
+    browser_context_pool_size: int = Field(default=4, ge=1)
 
     # Popbill API Configuration
     popbill_link_id: str = Field(default="", alias="POPBILL_LINK_ID")
@@ -64,11 +70,16 @@ class Settings(BaseSettings):
     log_format: str = "json"
 
     @property
+    def playwright_headless(self) -> bool:
+        """Return headless mode (alias of browser_headless for backward compatibility)."""
+        return self.browser_headless
+
+    @cached_property
     def grpc_address(self) -> str:
         """Return gRPC server address."""
         return f"{self.grpc_host}:{self.grpc_port}"
 
-    @property
+    @cached_property
     def redis_url(self) -> str:
         """Return Redis connection URL."""
         if self.redis_password:
@@ -76,7 +87,12 @@ class Settings(BaseSettings):
         return f"redis://{self.redis_host}:{self.redis_port}/{self.redis_db}"
 
 
-@lru_cache
+_settings: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    """Get the process-wide settings instance, loading it on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
@@ -8,6 +8,11 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
 from config.settings import get_settings
 from src.server import serve
 from src.utils.logger import setup_logger
@@ -24,11 +29,15 @@ def main() -> None:
     ===============================================
     Environment: {settings.environment}
     gRPC Server: {settings.grpc_host}:{settings.grpc_port}
-    Headless:    {settings.playwright_headless}
+    Headless:    {settings.browser_headless}
     ===============================================
     """)
 
-    asyncio.run(serve())
+    # uvloop's libuv-based loop cuts per-await overhead on gRPC and CDP sockets
+    if uvloop is not None:
+        uvloop.run(serve())
+    else:
+        asyncio.run(serve())
 
 
 if __name__ == "__main__":
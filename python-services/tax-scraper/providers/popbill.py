@@ -7,24 +7,60 @@ management, integrating with the National Tax Service (NTS).
 API Documentation: https://developers.popbill.com
 """
 
-import base64
+import asyncio
+import binascii
 import hashlib
 import hmac
-import json
+import math
+import random
 import time
 import uuid
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Optional
-from urllib.parse import urljoin
 
 import httpx
+import orjson
 import structlog
 
 logger = structlog.get_logger()
 
+_TOKEN_SCOPE = "111"  # Tax invoice scope
+
+_TOKEN_REFRESH_MARGIN = 300.0  # Refresh tokens 5 minutes before expiry
+
+# Access tokens shared by all clients, keyed by (link_id, is_test, scope).
+# Values hold the token and its expiry on the time.monotonic() clock.
+_TOKEN_CACHE: dict[tuple[str, bool, str], tuple[str, float]] = {}
+# Refresh locks by the same key, with the event loop each belongs to: an
+# asyncio.Lock binds to the first loop that waits on it
+_TOKEN_LOCKS: dict[tuple[str, bool, str], tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = {}
+
+# Read-only GET responses are cached per client for dashboard polling
+_QUERY_CACHE_SIZE = 1024
+_QUERY_CACHE_TTL = 30.0
+_QUERY_CACHE_PENDING_TTL = 5.0  # Submitted/sent invoices are polled for NTS results
+_QUERY_CACHE_TERMINAL_TTL = 3600.0  # Confirmed/cancelled invoices no longer change
+
+
+@lru_cache(maxsize=256)
+def _mask_corp_num(corp_num: str) -> str:
+    """Mask a business number for logging, memoized per number."""
+    return corp_num[:6] + "****"
+
+
+def _token_lock(cache_key: tuple[str, bool, str]) -> asyncio.Lock:
+    """Return the token refresh lock for a key on the running event loop."""
+    loop = asyncio.get_running_loop()
+    entry = _TOKEN_LOCKS.get(cache_key)
+    if entry is None or entry[0] is not loop:
+        # First use, or the previous loop has gone (e.g. a new asyncio.run())
+        entry = _TOKEN_LOCKS[cache_key] = (loop, asyncio.Lock())
+    return entry[1]
+
 
 class PopbillError(Exception):
     """Exception for Popbill API errors."""
@@ -48,6 +84,11 @@ class PopbillInvoiceType(str, Enum):
     PURCHASE = "02"  # Purchase tax invoice
     COMMISSION = "03"  # Commission tax invoice
 
+    @classmethod
+    def from_code(cls, code: str) -> Optional["PopbillInvoiceType"]:
+        """Look up a type by API code without Enum call overhead."""
+        return _INVOICE_TYPE_BY_CODE.get(code)
+
 
 class PopbillInvoiceStatus(str, Enum):
     """Popbill invoice status codes."""
@@ -59,6 +100,18 @@ class PopbillInvoiceStatus(str, Enum):
     NTS_REJECTED = "302"  # NTS rejected
     CANCELLED = "400"  # Cancelled
 
+    @classmethod
+    def from_code(cls, code: str) -> Optional["PopbillInvoiceStatus"]:
+        """Look up a status by API code without Enum call overhead."""
+        return _INVOICE_STATUS_BY_CODE.get(code)
+
+
+# Flat code -> member tables, built once at import
+_INVOICE_TYPE_BY_CODE: dict[str, PopbillInvoiceType] = {m.value: m for m in PopbillInvoiceType}
+_INVOICE_STATUS_BY_CODE: dict[str, PopbillInvoiceStatus] = {m.value: m for m in PopbillInvoiceStatus}
+_TERMINAL_STATUSES = frozenset({PopbillInvoiceStatus.NTS_CONFIRMED, PopbillInvoiceStatus.CANCELLED})
+_PENDING_STATUSES = frozenset({PopbillInvoiceStatus.SUBMITTED, PopbillInvoiceStatus.SENT_TO_NTS})
+
 
 @dataclass
 class PopbillConfig:
@@ -70,6 +123,7 @@ class PopbillConfig:
     timeout: float = 30.0  # Request timeout in seconds
     retry_count: int = 3  # Number of retries for failed requests
     retry_delay: float = 1.0  # Delay between retries in seconds
+    max_retry_wait: float = 60.0  # Longest server-requested Retry-After to wait out
 
     @property
     def base_url(self) -> str:
@@ -79,7 +133,7 @@ class PopbillConfig:
         return "https://popbill.linkhub.co.kr"
 
 
-@dataclass
+@dataclass(slots=True)
 class PopbillTaxInvoice:
     """Tax invoice data structure for Popbill API."""
 
@@ -158,7 +212,7 @@ class PopbillTaxInvoice:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PopbillIssueResult:
     """Result of tax invoice issuance."""
 
@@ -189,15 +243,27 @@ class PopbillClient:
         """
         self.config = config
         self.log = logger.bind(component="PopbillClient")
-        self._access_token: Optional[str] = None
-        self._token_expires_at: Optional[datetime] = None
+        # Endpoints are absolute paths, so URLs are built by concatenation
+        self._base_url = config.base_url.rstrip("/")
+        # Keyed HMAC state, copied per signature to skip the key schedule
+        self._hmac_template = hmac.new(config.secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+        # One pooled HTTP/2 connection multiplexes the token/issue/query calls
         self._client = httpx.AsyncClient(
-            timeout=config.timeout,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=60.0,
+            ),
+            timeout=httpx.Timeout(config.timeout, connect=5.0),
             headers={
                 "Content-Type": "application/json",
                 "Accept": "application/json",
             },
         )
+        # LRU of GET responses: key -> (expiry on time.monotonic(), response)
+        self._query_cache: OrderedDict[tuple[Any, ...], tuple[float, bytes]] = OrderedDict()
+        self._query_locks: defaultdict[tuple[Any, ...], asyncio.Lock] = defaultdict(asyncio.Lock)
 
     async def close(self) -> None:
         """Close the HTTP client."""
@@ -212,54 +278,57 @@ class PopbillClient:
         Returns:
             Access token string
         """
-        # Check if existing token is still valid
-        if (
-            self._access_token
-            and self._token_expires_at
-            and datetime.now() < self._token_expires_at - timedelta(minutes=5)
-        ):
-            return self._access_token
+        cache_key = (self.config.link_id, self.config.is_test, _TOKEN_SCOPE)
 
-        # Request new token
-        self.log.info("requesting_access_token", corp_num=corp_num[:6] + "****")
+        async with _token_lock(cache_key):
+            # Check if a token shared by any client is still valid
+            cached = _TOKEN_CACHE.get(cache_key)
+            if cached and time.monotonic() < cached[1] - _TOKEN_REFRESH_MARGIN:
+                return cached[0]
 
-        timestamp = str(int(time.time()))
-        service_id = "POPBILL"
+            # Request new token
+            self.log.info("requesting_access_token", corp_num=_mask_corp_num(corp_num))
 
-        # Create signature
-        sig_target = f"{self.config.link_id}\n{timestamp}\n"
-        signature = base64.b64encode(
-            hmac.new(
-                self.config.secret_key.encode("utf-8"),
-                sig_target.encode("utf-8"),
-                hashlib.sha256,
-            ).digest()
-        ).decode("utf-8")
+            timestamp = str(int(time.time()))
 
-        headers = {
-            "x-lh-linkID": self.config.link_id,
-            "x-lh-timestamp": timestamp,
-            "x-lh-signature": signature,
-        }
+            headers = {
+                "x-lh-linkID": self.config.link_id,
+                "x-lh-timestamp": timestamp,
+                "x-lh-signature": self._sign(timestamp),
+            }
 
-        url = f"{self.config.base_url}/POPBILL/Token"
-        payload = {
-            "access_id": self.config.link_id,
-            "scope": ["111"],  # Tax invoice scope
-        }
+            url = f"{self._base_url}/POPBILL/Token"
+            payload = {
+                "access_id": self.config.link_id,
+                "scope": [_TOKEN_SCOPE],
+            }
 
-        response = await self._client.post(url, headers=headers, json=payload)
+            response = await self._client.post(url, headers=headers, content=orjson.dumps(payload))
 
-        if response.status_code != 200:
-            raise PopbillError("TOKEN_ERROR", f"Failed to get access token: {response.text}")
+            if response.status_code != 200:
+                raise PopbillError("TOKEN_ERROR", f"Failed to get access token: {response.text}")
 
-        data = response.json()
-        self._access_token = data.get("access_token")
-        expires_in = data.get("expires_in", 3600)
-        self._token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+            data = orjson.loads(response.content)
+            access_token = data.get("access_token")
+            expires_in = data.get("expires_in", 3600)
+            _TOKEN_CACHE[cache_key] = (access_token, time.monotonic() + expires_in)
 
-        self.log.info("access_token_obtained", expires_in=expires_in)
-        return self._access_token
+            self.log.info("access_token_obtained", expires_in=expires_in)
+            return access_token
+
+    def _sign(self, timestamp: str) -> str:
+        """Create the base64 HMAC-SHA256 signature for a token request.
+
+        Args:
+            timestamp: Unix timestamp string sent in x-lh-timestamp
+
+        Returns:
+            Base64-encoded signature
+        """
+        sig_target = f"{self.config.link_id}\n{timestamp}\n"
+        mac = self._hmac_template.copy()
+        mac.update(sig_target.encode("utf-8"))
+        return binascii.b2a_base64(mac.digest(), newline=False).decode("ascii")
 
     async def _request(
         self,
@@ -288,24 +357,26 @@ class PopbillClient:
             "x-pb-userid": user_id or "",
         }
 
-        url = urljoin(self.config.base_url, endpoint)
+        url = self._base_url + endpoint
+        # Encode POST bodies once, straight to bytes, outside the retry loop
+        body = orjson.dumps(data) if data is not None and method.upper() == "POST" else None
 
         for attempt in range(self.config.retry_count):
             try:
                 if method.upper() == "GET":
                     response = await self._client.get(url, headers=headers, params=data)
                 elif method.upper() == "POST":
-                    response = await self._client.post(url, headers=headers, json=data)
+                    response = await self._client.post(url, headers=headers, content=body)
                 elif method.upper() == "DELETE":
                     response = await self._client.delete(url, headers=headers)
                 else:
                     raise ValueError(f"Unsupported HTTP method: {method}")
 
                 if response.status_code == 200:
-                    return response.json()
+                    return orjson.loads(response.content)
 
                 # Handle API errors
-                error_data = response.json()
+                error_data = orjson.loads(response.content)
                 error_code = str(error_data.get("code", "UNKNOWN"))
                 error_msg = error_data.get("message", "Unknown error")
 
@@ -317,10 +388,16 @@ class PopbillClient:
                     error_message=error_msg,
                 )
 
-                # Don't retry for client errors (4xx)
-                if 400 <= response.status_code < 500:
+                # Don't retry for client errors (4xx) other than throttling
+                if 400 <= response.status_code < 500 and response.status_code != 429:
                     raise PopbillError(error_code, error_msg)
 
+                if attempt < self.config.retry_count - 1:
+                    # Fail fast rather than park the request on a long Retry-After
+                    retry_after = response.headers.get("Retry-After")
+                    if not await self._sleep_for_retry(attempt, retry_after):
+                        raise PopbillError(error_code, error_msg)
+
             except httpx.RequestError as e:
                 self.log.warning(
                     "request_error",
@@ -331,15 +408,98 @@ class PopbillClient:
                 if attempt == self.config.retry_count - 1:
                     raise PopbillError("REQUEST_ERROR", f"Request failed: {str(e)}")
 
-                await self._sleep_for_retry()
+                await self._sleep_for_retry(attempt)
 
         raise PopbillError("MAX_RETRIES", "Maximum retry attempts exceeded")
 
-    async def _sleep_for_retry(self) -> None:
-        """Sleep before retry."""
-        import asyncio
+    async def _cached_get(
+        self,
+        endpoint: str,
+        corp_num: str,
+        params: Optional[dict[str, Any]] = None,
+        user_id: Optional[str] = None,
+        ttl: float = _QUERY_CACHE_TTL,
+    ) -> dict[str, Any]:
+        """Make a GET request through the per-client TTL cache.
 
-        await asyncio.sleep(self.config.retry_delay)
+        Concurrent callers for the same key share a single in-flight request.
+        Responses are cached as JSON bytes and decoded per hit, so each
+        caller gets its own copy and mutating a result cannot corrupt the
+        cached entry.
+
+        Args:
+            endpoint: API endpoint path
+            corp_num: Business registration number
+            params: Query parameters
+            user_id: Optional user ID for audit
+            ttl: Seconds to keep the response
+
+        Returns:
+            Response data dictionary
+        """
+        key = (endpoint, frozenset(params.items()) if params else None)
+        lock = self._query_locks[key]
+
+        try:
+            async with lock:
+                cached = self._query_cache.get(key)
+                if cached and time.monotonic() < cached[0]:
+                    self._query_cache.move_to_end(key)
+                    return orjson.loads(cached[1])
+
+                response = await self._request("GET", endpoint, corp_num, params, user_id)
+
+                status = PopbillInvoiceStatus.from_code(str(response.get("stateCode", "")))
+                if status in _TERMINAL_STATUSES:
+                    ttl = max(ttl, _QUERY_CACHE_TERMINAL_TTL)
+                elif status in _PENDING_STATUSES:
+                    ttl = min(ttl, _QUERY_CACHE_PENDING_TTL)
+
+                self._query_cache[key] = (time.monotonic() + ttl, orjson.dumps(response))
+                self._query_cache.move_to_end(key)
+                if len(self._query_cache) > _QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+                return response
+        finally:
+            # Waiters keep their reference; new callers hit the cache or retry.
+            # A later caller may already have installed a fresh lock for the key.
+            if self._query_locks.get(key) is lock:
+                del self._query_locks[key]
+
+    def _invalidate_invoice(self, corp_num: str, invoice_number: str) -> None:
+        """Drop cached responses made stale by a change to an invoice.
+
+        Besides the invoice's own query, this covers the company's search
+        results and point balance, which issuing consumes.
+        """
+        self._query_cache.pop((f"/Taxinvoice/{corp_num}/{invoice_number}", None), None)
+        stale = (f"/Taxinvoice/{corp_num}/Search", f"/Taxinvoice/{corp_num}/Balance")
+        for key in [k for k in self._query_cache if k[0] in stale]:
+            del self._query_cache[key]
+
+    async def _sleep_for_retry(self, attempt: int, retry_after: Optional[str] = None) -> bool:
+        """Sleep before retry using exponential backoff with jitter.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            retry_after: Retry-After header value (seconds), honored if present
+
+        Returns:
+            False without sleeping if Retry-After exceeds config.max_retry_wait
+        """
+        delay = self.config.retry_delay * (2**attempt) + random.uniform(0, 0.25)
+        if retry_after:
+            try:
+                requested = float(retry_after)
+            except ValueError:
+                requested = math.nan  # HTTP-date form is not used by Popbill
+            if requested > self.config.max_retry_wait:
+                self.log.warning("retry_after_too_long", retry_after=retry_after)
+                return False
+            if requested == requested:  # Skip NaN
+                delay = max(delay, requested)
+        await asyncio.sleep(delay)
+        return True
 
     async def issue_tax_invoice(
         self,
@@ -364,8 +524,8 @@ class PopbillClient:
         """
         self.log.info(
             "issuing_tax_invoice",
-            corp_num=corp_num[:6] + "****",
-            buyer=invoice.invoicee_corp_num[:6] + "****" if invoice.invoicee_corp_num else "N/A",
+            corp_num=_mask_corp_num(corp_num),
+            buyer=_mask_corp_num(invoice.invoicee_corp_num) if invoice.invoicee_corp_num else "N/A",
             amount=invoice.total_amount,
         )
 
@@ -385,6 +545,7 @@ class PopbillClient:
                 invoice_number=response.get("invoiceNumber", invoice.invoice_number),
                 nts_confirm_number=response.get("ntsconfirmNum", ""),
             )
+            self._invalidate_invoice(corp_num, result.invoice_number)
 
             self.log.info(
                 "tax_invoice_issued",
@@ -406,6 +567,61 @@ class PopbillClient:
                 error_message=e.message,
             )
 
+    async def issue_tax_invoices_batch(
+        self,
+        corp_num: str,
+        invoices: list[PopbillTaxInvoice],
+        memo: str = "",
+        force_send: bool = False,
+        user_id: Optional[str] = None,
+        concurrency: int = 10,
+    ) -> list[PopbillIssueResult]:
+        """
+        Issue multiple tax invoices concurrently.
+
+        Requests overlap on the shared connection, with at most
+        ``concurrency`` in flight at once.
+
+        Args:
+            corp_num: Business registration number (10 digits)
+            invoices: Tax invoices to issue
+            memo: Optional memo applied to every invoice
+            force_send: Send to NTS immediately
+            user_id: Optional user ID for audit
+            concurrency: Maximum number of in-flight requests
+
+        Returns:
+            PopbillIssueResult per invoice, in input order
+
+        Raises:
+            ValueError: If concurrency is less than 1
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def issue_one(invoice: PopbillTaxInvoice) -> PopbillIssueResult:
+            async with semaphore:
+                return await self.issue_tax_invoice(corp_num, invoice, memo, force_send, user_id)
+
+        results = await asyncio.gather(
+            *(issue_one(invoice) for invoice in invoices),
+            return_exceptions=True,
+        )
+
+        return [
+            result
+            if isinstance(result, PopbillIssueResult)
+            else PopbillIssueResult(
+                success=False,
+                invoice_number=invoice.invoice_number,
+                error_code="UNEXPECTED_ERROR",
+                error_message=str(result),
+            )
+            for invoice, result in zip(invoices, results)
+        ]
+
     async def query_tax_invoice(
         self,
         corp_num: str,
@@ -425,14 +641,14 @@ class PopbillClient:
         """
         self.log.info(
             "querying_tax_invoice",
-            corp_num=corp_num[:6] + "****",
+            corp_num=_mask_corp_num(corp_num),
             invoice_number=invoice_number,
         )
 
         endpoint = f"/Taxinvoice/{corp_num}/{invoice_number}"
 
         try:
-            response = await self._request("GET", endpoint, corp_num, user_id=user_id)
+            response = await self._cached_get(endpoint, corp_num, user_id=user_id)
             self.log.info("query_success", invoice_number=invoice_number)
             return response
 
@@ -460,7 +676,7 @@ class PopbillClient:
         """
         self.log.info(
             "cancelling_tax_invoice",
-            corp_num=corp_num[:6] + "****",
+            corp_num=_mask_corp_num(corp_num),
             invoice_number=invoice_number,
         )
 
@@ -469,6 +685,7 @@ class PopbillClient:
 
         try:
             await self._request("POST", endpoint, corp_num, payload, user_id)
+            self._invalidate_invoice(corp_num, invoice_number)
             self.log.info("cancel_success", invoice_number=invoice_number)
             return True
 
@@ -491,12 +708,12 @@ class PopbillClient:
         Returns:
             Remaining API points
         """
-        self.log.info("checking_balance", corp_num=corp_num[:6] + "****")
+        self.log.info("checking_balance", corp_num=_mask_corp_num(corp_num))
 
         endpoint = f"/Taxinvoice/{corp_num}/Balance"
 
         try:
-            response = await self._request("GET", endpoint, corp_num)
+            response = await self._cached_get(endpoint, corp_num)
             balance = int(response.get("balance", 0))
             self.log.info("balance_checked", balance=balance)
             return balance
@@ -533,7 +750,7 @@ class PopbillClient:
         """
         self.log.info(
             "searching_tax_invoices",
-            corp_num=corp_num[:6] + "****",
+            corp_num=_mask_corp_num(corp_num),
             invoice_type=invoice_type,
             date_range=f"{start_date}-{end_date}",
         )
@@ -552,7 +769,7 @@ class PopbillClient:
             params["State"] = ",".join(state)
 
         try:
-            response = await self._request("GET", endpoint, corp_num, params, user_id)
+            response = await self._cached_get(endpoint, corp_num, params, user_id)
             total = response.get("total", 0)
             self.log.info("search_complete", total_count=total)
             return response
@@ -579,7 +796,7 @@ class PopbillClient:
         """
         self.log.info(
             "registering_webhook",
-            corp_num=corp_num[:6] + "****",
+            corp_num=_mask_corp_num(corp_num),
             callback_url=callback_url,
         )
 
@@ -616,7 +833,7 @@ class PopbillClient:
         """
         self.log.info(
             "sending_to_nts",
-            corp_num=corp_num[:6] + "****",
+            corp_num=_mask_corp_num(corp_num),
             invoice_number=invoice_number,
         )
 
@@ -624,6 +841,7 @@ class PopbillClient:
 
         try:
             await self._request("POST", endpoint, corp_num, user_id=user_id)
+            self._invalidate_invoice(corp_num, invoice_number)
             self.log.info("sent_to_nts", invoice_number=invoice_number)
             return True
 
@@ -4,18 +4,28 @@ SEED is a symmetric block cipher developed by KISA (Korea Internet & Security Ag
 It uses 128-bit keys and 128-bit blocks.
 """
 
+import hashlib
+import os
+from collections import OrderedDict
 from typing import ClassVar
 
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.padding import PKCS7
 from loguru import logger
 
+_KDF_ITERATIONS = 100000
+_KDF_CACHE_SIZE = 128
+
+# Derived keys by (sha256(password), salt), least recently used first
+_KDF_CACHE: OrderedDict[tuple[bytes, bytes], bytes] = OrderedDict()
+
 
 class SEEDCipher:
     """SEED cipher implementation.
 
-    Note: Python's pycryptodome doesn't have native SEED support.
-    This implementation uses AES as a placeholder.
+    Note: OpenSSL builds commonly ship without SEED support.
+    This implementation uses AES (OpenSSL-backed, AES-NI where available)
+    as a placeholder.
     For production, use pyseed or implement native SEED.
     """
 
@@ -46,18 +56,32 @@ class SEEDCipher:
         Returns:
             IV + ciphertext (IV is prepended)
         """
-        from Crypto.Random import get_random_bytes
+        block = self.BLOCK_SIZE
+        iv = os.urandom(block)
 
-        iv = get_random_bytes(self.BLOCK_SIZE)
+        # PKCS7: whole blocks are encrypted straight from the input; only the
+        # final partial block is copied to append its padding
+        full = len(plaintext) - len(plaintext) % block
+        pad_len = block - (len(plaintext) - full)
+        tail = bytes(plaintext[full:]) + bytes((pad_len,)) * pad_len
+        total = block + full + block
 
         # Using AES as placeholder for SEED
         # In production, replace with actual SEED implementation
-        cipher = AES.new(self._key, AES.MODE_CBC, iv)
-        padded = pad(plaintext, self.BLOCK_SIZE)
-        ciphertext = cipher.encrypt(padded)
+        # Output is laid out as IV || ciphertext in a single buffer;
+        # update_into() requires block - 1 bytes of slack past the data
+        out = bytearray(total + block - 1)
+        out[:block] = iv
+        encryptor = Cipher(algorithms.AES(self._key), modes.CBC(iv)).encryptor()
+        with memoryview(out) as view, memoryview(plaintext) as source:
+            written = block
+            written += encryptor.update_into(source[:full], view[written:])
+            written += encryptor.update_into(tail, view[written:])
+            encryptor.finalize()
+            ciphertext = bytes(view[:written])
 
         logger.debug(f"Encrypted {len(plaintext)} bytes")
-        return iv + ciphertext
+        return ciphertext
 
     def decrypt(self, ciphertext: bytes) -> bytes:
         """Decrypt ciphertext using SEED-CBC.
@@ -75,9 +99,10 @@ class SEEDCipher:
         encrypted = ciphertext[self.BLOCK_SIZE :]
 
         # Using AES as placeholder for SEED
-        cipher = AES.new(self._key, AES.MODE_CBC, iv)
-        padded = cipher.decrypt(encrypted)
-        plaintext = unpad(padded, self.BLOCK_SIZE)
+        decryptor = Cipher(algorithms.AES(self._key), modes.CBC(iv)).decryptor()
+        padded = decryptor.update(encrypted) + decryptor.finalize()
+        unpadder = PKCS7(self.BLOCK_SIZE * 8).unpadder()
+        plaintext = unpadder.update(padded) + unpadder.finalize()
 
         logger.debug(f"Decrypted {len(plaintext)} bytes")
         return plaintext
@@ -101,13 +126,14 @@ class SEEDCipher:
 
 def generate_seed_key() -> bytes:
     """Generate a random SEED key."""
-    from Crypto.Random import get_random_bytes
-
-    return get_random_bytes(SEEDCipher.KEY_SIZE)
+    return os.urandom(SEEDCipher.KEY_SIZE)
 
 
 def derive_key_from_password(password: str, salt: bytes | None = None) -> tuple[bytes, bytes]:
-    """Derive SEED key from password using PBKDF2.
+    """Derive SEED key from password using PBKDF2-HMAC-SHA1.
+
+    Keys derived for a (password, salt) pair are cached for the process
+    lifetime, keyed by a SHA-256 digest of the password.
 
     Args:
         password: Password string
@@ -115,12 +141,27 @@ def derive_key_from_password(password: str, salt: bytes | None = None) -> tuple[
 
     Returns:
         Tuple of (key, salt)
-    """
-    from Crypto.Protocol.KDF import PBKDF2
-    from Crypto.Random import get_random_bytes
 
+    Raises:
+        UnicodeEncodeError: If the password has characters outside latin-1
+    """
     if salt is None:
-        salt = get_random_bytes(16)
+        salt = os.urandom(16)
+
+    # latin-1 keeps keys identical to the previous pycryptodome PBKDF2,
+    # which also rejected passwords outside latin-1
+    secret = password.encode("latin-1")
+
+    cache_key = (hashlib.sha256(secret).digest(), salt)
+    key = _KDF_CACHE.get(cache_key)
+    if key is None:
+        key = hashlib.pbkdf2_hmac(
+            "sha1", secret, salt, _KDF_ITERATIONS, dklen=SEEDCipher.KEY_SIZE
+        )
+        _KDF_CACHE[cache_key] = key
+        if len(_KDF_CACHE) > _KDF_CACHE_SIZE:
+            _KDF_CACHE.popitem(last=False)
+    else:
+        _KDF_CACHE.move_to_end(cache_key)
 
-    key = PBKDF2(password, salt, dkLen=SEEDCipher.KEY_SIZE, count=100000)
     return key, salt
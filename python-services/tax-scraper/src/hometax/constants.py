@@ -1,11 +1,19 @@
 """
 Hometax constants and configuration values.
+
+Lookup tables are read-only MappingProxyType views so shared module
+state cannot be mutated by a caller.
 """
 
+import re
+from types import MappingProxyType
+
 # Hometax URLs
 HOMETAX_BASE_URL = "https://www.hometax.go.kr"
 HOMETAX_MAIN_URL = f"{HOMETAX_BASE_URL}/websquare/websquare.wq"
 HOMETAX_LOGIN_URL = f"{HOMETAX_BASE_URL}/wqAction.do"
+# Any page or asset served from hometax.go.kr or one of its subdomains
+HOMETAX_URL_PATTERN = re.compile(r"^https?://(?:[\w-]+\.)*hometax\.go\.kr(?::\d+)?/")
 
 # Menu IDs
 MENU_TAX_INVOICE_SALES = "UTXPPBAA01"  # 세금계산서 발급
@@ -20,25 +28,25 @@ STATUS_CONFIRMED = "04"
 STATUS_CANCELLED = "05"
 STATUS_REJECTED = "06"
 
-STATUS_MAP = {
+STATUS_MAP = MappingProxyType({
     STATUS_DRAFT: "draft",
     STATUS_ISSUED: "issued",
     STATUS_TRANSMITTED: "transmitted",
     STATUS_CONFIRMED: "confirmed",
     STATUS_CANCELLED: "cancelled",
     STATUS_REJECTED: "rejected",
-}
+})
 
 # Tax types
 TAX_TYPE_TAXABLE = "01"  # 과세
 TAX_TYPE_ZERO = "02"  # 영세
 TAX_TYPE_EXEMPT = "03"  # 면세
 
-TAX_TYPE_MAP = {
+TAX_TYPE_MAP = MappingProxyType({
     TAX_TYPE_TAXABLE: "taxable",
     TAX_TYPE_ZERO: "zero_rate",
     TAX_TYPE_EXEMPT: "exempt",
-}
+})
 
 # Invoice types
 INVOICE_TYPE_NORMAL = "01"  # 일반
@@ -51,7 +59,7 @@ AUTH_SIMPLE = "simple_auth"
 AUTH_ID_PW = "id_password"
 
 # Selectors for Playwright
-SELECTORS = {
+SELECTORS = MappingProxyType({
     # Login page
     "login_cert_btn": "#cert_login_btn",
     "login_id_input": "#user_id",
@@ -95,7 +103,28 @@ SELECTORS = {
     "alert_popup": ".alert_popup",
     "confirm_btn": ".confirm_btn",
     "close_btn": ".close_btn",
-}
+    "busy_indicator": ".is-animating, .loading, .spinner",
+})
+
+# Form value or trimmed text of the first match, "" when nothing matches
+ELEMENT_VALUE_JS = """(sel) => {
+    const e = document.querySelector(sel);
+    if (!e) return '';
+    const t = e.tagName.toLowerCase();
+    if (t === 'input' || t === 'select' || t === 'textarea') return e.value || '';
+    return (e.textContent || '').trim();
+}"""
+
+# True once no busy indicator matching the selector argument is visible
+PAGE_SETTLED_JS = """(sel) => !Array.from(document.querySelectorAll(sel)).some(
+    (e) => e.offsetParent !== null
+)"""
+
+# Hometax requests aborted by browser contexts: the scraper only reads the DOM
+# and XHR responses. Stylesheets are kept since visibility checks depend on
+# them. Third-party hosts (certificate and auth modules) are never routed.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+BLOCKED_URL_KEYWORDS = ("analytics", "googletagmanager", "beacon")
 
 # Error messages
 ERROR_MESSAGES = {
@@ -0,0 +1,107 @@
+"""
+Pool of pre-warmed Playwright browser contexts.
+
+Creating a BrowserContext costs a few hundred milliseconds, so contexts are
+created ahead of time. A returned context is closed rather than reused -
+localStorage, IndexedDB and the HTTP cache of the previous login cannot be
+cleared - and a fresh replacement is created in the background.
+"""
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+import structlog
+from playwright.async_api import BrowserContext
+
+logger = structlog.get_logger()
+
+
+class ContextPool:
+    """
+    Pool of pre-created, single-use browser contexts.
+
+    Up to ``size`` idle contexts are kept ready. Checkouts beyond that create
+    a fresh context, so a context held by a long-lived login session never
+    blocks other logins. Every checked-out context serves a single login and
+    is closed on release, never handed out again; the pool then creates a
+    replacement in the background.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Awaitable[BrowserContext]],
+        size: int,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Coroutine function creating a configured context
+            size: Maximum number of idle contexts kept ready
+        """
+        self._factory = factory
+        self._size = size
+        self._idle: deque[BrowserContext] = deque()
+        self._refill_task: Optional[asyncio.Task] = None
+        self.log = logger.bind(component="ContextPool")
+
+    @property
+    def idle_count(self) -> int:
+        """Number of contexts ready for checkout."""
+        return len(self._idle)
+
+    async def start(self) -> None:
+        """Pre-create contexts until the pool is full."""
+        while len(self._idle) < self._size:
+            self._idle.append(await self._factory())
+        self.log.info("context_pool_warmed", size=self._size)
+
+    async def acquire(self) -> BrowserContext:
+        """Check out a context, creating one if none are idle."""
+        while self._idle:
+            context = self._idle.popleft()
+            # Contexts die with their browser; skip any left from a crash
+            if context.browser is None or context.browser.is_connected():
+                return context
+        return await self._factory()
+
+    async def release(self, context: BrowserContext) -> None:
+        """
+        Close a context and top the pool back up in the background.
+
+        Args:
+            context: Context previously returned by acquire()
+        """
+        try:
+            await context.close()
+        except Exception as e:
+            self.log.warning("context_close_failed", error=str(e))
+
+        if len(self._idle) < self._size and (
+            self._refill_task is None or self._refill_task.done()
+        ):
+            self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self) -> None:
+        """Create fresh contexts until the pool is full."""
+        try:
+            while len(self._idle) < self._size:
+                self._idle.append(await self._factory())
+        except Exception as e:
+            self.log.warning("context_pool_refill_failed", error=str(e))
+
+    async def close(self) -> None:
+        """Stop refilling and close all idle contexts."""
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+        while self._idle:
+            context = self._idle.popleft()
+            try:
+                await context.close()
+            except Exception as e:
+                self.log.warning("context_close_failed", error=str(e))
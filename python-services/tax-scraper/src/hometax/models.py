@@ -4,9 +4,12 @@ Data models for Hometax tax invoice operations.
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Optional
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+# 10-digit business registration number (사업자등록번호) without dashes
+BusinessNumber = Annotated[str, StringConstraints(min_length=10, max_length=10)]
 
 
 class AuthType(str, Enum):
@@ -37,6 +40,8 @@ class InvoiceStatus(str, Enum):
 class HometaxSession(BaseModel):
     """Hometax session information."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     session_id: str
     business_number: str
     company_name: str
@@ -48,6 +53,8 @@ class HometaxSession(BaseModel):
 class TaxInvoiceItem(BaseModel):
     """Individual item in a tax invoice."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     sequence: int = 1
     supply_date: Optional[datetime] = None
     description: str
@@ -62,6 +69,8 @@ class TaxInvoiceItem(BaseModel):
 class TaxInvoice(BaseModel):
     """Tax invoice (Sae-Geum-Gye-San-Seo) model."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     # Invoice identification
     invoice_number: str
     issue_date: datetime
@@ -69,7 +78,7 @@ class TaxInvoice(BaseModel):
     status: InvoiceStatus = InvoiceStatus.DRAFT
 
     # Supplier (seller) information
-    supplier_business_number: str = Field(..., min_length=10, max_length=10)
+    supplier_business_number: BusinessNumber
     supplier_name: str
     supplier_ceo_name: str = ""
     supplier_address: str = ""
@@ -78,7 +87,7 @@ class TaxInvoice(BaseModel):
     supplier_email: str = ""
 
     # Buyer (purchaser) information
-    buyer_business_number: str = Field(..., min_length=10, max_length=10)
+    buyer_business_number: BusinessNumber
     buyer_name: str
     buyer_ceo_name: str = ""
     buyer_address: str = ""
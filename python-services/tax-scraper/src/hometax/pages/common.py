@@ -0,0 +1,26 @@
+"""
+Helpers shared by the Hometax page objects.
+"""
+from datetime import date
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
+
+from ..constants import PAGE_SETTLED_JS, SELECTORS, TIMEOUTS
+
+
+def yyyymmdd(d: date) -> str:
+    """Format a date as YYYYMMDD without going through strftime."""
+    return f"{d.year:04d}{d.month:02d}{d.day:02d}"
+
+
+async def wait_until_settled(page: Page) -> None:
+    """Wait until no busy indicator is visible, giving up after the animation timeout."""
+    try:
+        # Returns as soon as the page is idle; animation is only the cap
+        await page.wait_for_function(
+            PAGE_SETTLED_JS,
+            arg=SELECTORS["busy_indicator"],
+            timeout=TIMEOUTS["animation"],
+        )
+    except PlaywrightTimeout:
+        pass
@@ -1,7 +1,7 @@
 """
 Tax invoice issuance page object.
 """
-import asyncio
+import re
 from datetime import datetime
 from typing import Optional
 
@@ -9,20 +9,54 @@ import structlog
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
 
 from ..constants import (
+    ELEMENT_VALUE_JS,
     MENU_TAX_INVOICE_SALES,
     SELECTORS,
     TIMEOUTS,
 )
 from ..models import IssuedInvoiceResult, TaxInvoice
+from .common import wait_until_settled, yyyymmdd
 
 logger = structlog.get_logger()
 
+# Alert wording that indicates the invoice was issued
+_SUCCESS_RE = re.compile("정상|완료|발급")
+
+# Sets many form fields in one round-trip; mapping is {selector: value}
+_BULK_FILL_JS = """(m) => {
+    for (const [s, v] of Object.entries(m)) {
+        const e = document.querySelector(s);
+        if (!e) continue;
+        e.value = v;
+        e.dispatchEvent(new Event('input', {bubbles: true}));
+        e.dispatchEvent(new Event('change', {bubbles: true}));
+    }
+}"""
+
+# Clicks the "add row" button n times in one round-trip
+_ADD_ROWS_JS = """(n) => {
+    const btn = document.querySelector('#btn_add_row, .add_row');
+    if (!btn) return;
+    for (let i = 0; i < n; i++) btn.click();
+}"""
+
 
 class TaxInvoiceIssuePage:
     """
     Page object for tax invoice issuance operations.
     """
 
+    # (SELECTORS key, TaxInvoice attribute) pairs filled as str(value)
+    _SUPPLIER_FIELDS: tuple[tuple[str, str], ...] = (
+        ("form_supplier_brn", "supplier_business_number"),
+        ("form_supplier_name", "supplier_name"),
+    )
+    _DETAIL_FIELDS: tuple[tuple[str, str], ...] = (
+        ("form_buyer_name", "buyer_name"),
+        ("form_supply_amount", "supply_amount"),
+        ("form_tax_amount", "tax_amount"),
+    )
+
     def __init__(self, page: Page) -> None:
         """Initialize issue page with Playwright page instance."""
         self.page = page
@@ -94,74 +128,77 @@ class TaxInvoiceIssuePage:
 
     async def _fill_invoice_form(self, invoice: TaxInvoice) -> None:
         """Fill in the tax invoice issuance form."""
-        # Issue date
-        await self.page.fill(
-            SELECTORS["form_issue_date"],
-            invoice.issue_date.strftime("%Y%m%d"),
-        )
+        fields = {
+            SELECTORS["form_issue_date"]: yyyymmdd(invoice.issue_date),
+        }
 
         # Supplier info (should be pre-filled, but verify)
         supplier_brn = await self.page.input_value(SELECTORS["form_supplier_brn"])
         if not supplier_brn:
-            await self.page.fill(
-                SELECTORS["form_supplier_brn"],
-                invoice.supplier_business_number,
-            )
-            await self.page.fill(SELECTORS["form_supplier_name"], invoice.supplier_name)
+            for key, attr in self._SUPPLIER_FIELDS:
+                fields[SELECTORS[key]] = str(getattr(invoice, attr))
 
-        # Buyer info
-        await self.page.fill(SELECTORS["form_buyer_brn"], invoice.buyer_business_number)
+        # Buyer BRN goes in first: its lookup may fill in the remaining fields
+        fields[SELECTORS["form_buyer_brn"]] = invoice.buyer_business_number
+        await self._bulk_fill(fields)
         await self._wait_for_loading()  # BRN lookup may trigger
 
-        await self.page.fill(SELECTORS["form_buyer_name"], invoice.buyer_name)
-
-        # Amounts
-        await self.page.fill(
-            SELECTORS["form_supply_amount"],
-            str(invoice.supply_amount),
-        )
-        await self.page.fill(
-            SELECTORS["form_tax_amount"],
-            str(invoice.tax_amount),
+        await self._bulk_fill(
+            {SELECTORS[key]: str(getattr(invoice, attr)) for key, attr in self._DETAIL_FIELDS}
         )
 
         # Fill items if present
         if invoice.items:
             await self._fill_items(invoice.items)
 
-        # Remarks
+        # Remarks last: adding item rows may re-render the form
         if invoice.remarks:
-            remark_selector = "#remark1, #remark"
-            await self.page.fill(remark_selector, invoice.remarks)
+            await self._bulk_fill({"#remark1, #remark": invoice.remarks})
 
     async def _fill_items(self, items: list) -> None:
         """Fill in invoice line items."""
-        for i, item in enumerate(items):
-            # Add row if needed
-            if i > 0:
-                add_btn = await self.page.query_selector("#btn_add_row, .add_row")
-                if add_btn:
-                    await add_btn.click()
-                    await asyncio.sleep(0.2)
+        # Add the extra rows first so every row exists for the single fill
+        if len(items) > 1:
+            await self.page.evaluate(_ADD_ROWS_JS, len(items) - 1)
+            try:
+                await self.page.wait_for_function(
+                    "(sel) => document.querySelector(sel) !== null",
+                    arg=f"#item_{len(items) - 1}_itemName",
+                    timeout=TIMEOUTS["element_wait"],
+                )
+            except PlaywrightTimeout:
+                self.log.warning("item_rows_not_added", expected=len(items))
 
+        fields: dict[str, str] = {}
+        for i, item in enumerate(items):
             # Fill item fields (row index based selectors)
-            row_prefix = f"#item_{i}_" if i > 0 else "#item_0_"
+            row_prefix = f"#item_{i}_"
 
             if item.supply_date:
-                await self.page.fill(
-                    f"{row_prefix}purchaseDT",
-                    item.supply_date.strftime("%Y%m%d"),
-                )
+                fields[f"{row_prefix}purchaseDT"] = yyyymmdd(item.supply_date)
 
-            await self.page.fill(f"{row_prefix}itemName", item.description)
+            fields[f"{row_prefix}itemName"] = item.description
 
             if item.specification:
-                await self.page.fill(f"{row_prefix}spec", item.specification)
+                fields[f"{row_prefix}spec"] = item.specification
+
+            fields[f"{row_prefix}qty"] = str(item.quantity)
+            fields[f"{row_prefix}unitCost"] = str(item.unit_price)
+            fields[f"{row_prefix}supplyCost"] = str(item.amount)
+            fields[f"{row_prefix}tax"] = str(item.tax_amount)
+
+        await self._bulk_fill(fields)
+
+    async def _bulk_fill(self, mapping: dict[str, str]) -> None:
+        """Set several form fields in one page.evaluate round-trip.
 
-            await self.page.fill(f"{row_prefix}qty", str(item.quantity))
-            await self.page.fill(f"{row_prefix}unitCost", str(item.unit_price))
-            await self.page.fill(f"{row_prefix}supplyCost", str(item.amount))
-            await self.page.fill(f"{row_prefix}tax", str(item.tax_amount))
+        Missing selectors are skipped. Each field receives input and change
+        events so page scripts react as they would to fill().
+
+        Args:
+            mapping: Field values keyed by CSS selector
+        """
+        await self.page.evaluate(_BULK_FILL_JS, mapping)
 
     async def _check_issue_result(self) -> IssuedInvoiceResult:
         """Check the result of invoice issuance."""
@@ -172,7 +209,7 @@ class TaxInvoiceIssuePage:
             if alert_visible:
                 alert_text = await alert.text_content()
                 # Check if it's a success message
-                if "정상" in alert_text or "완료" in alert_text or "발급" in alert_text:
+                if alert_text and _SUCCESS_RE.search(alert_text):
                     # Close alert
                     confirm_btn = await alert.query_selector(SELECTORS["confirm_btn"])
                     if confirm_btn:
@@ -206,16 +243,7 @@ class TaxInvoiceIssuePage:
 
     async def _get_element_value(self, selector: str) -> str:
         """Get value from element."""
-        element = await self.page.query_selector(selector)
-        if not element:
-            return ""
-
-        tag = await element.evaluate("el => el.tagName")
-        if tag.lower() in ("input", "select"):
-            return await element.input_value() or ""
-        else:
-            text = await element.text_content()
-            return text.strip() if text else ""
+        return await self.page.evaluate(ELEMENT_VALUE_JS, selector)
 
     async def _wait_for_loading(self) -> None:
         """Wait for loading indicator to disappear."""
@@ -227,4 +255,4 @@ class TaxInvoiceIssuePage:
             )
         except PlaywrightTimeout:
             pass
-        await asyncio.sleep(TIMEOUTS["animation"] / 1000)
+        await wait_until_settled(self.page)
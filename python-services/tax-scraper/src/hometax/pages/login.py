@@ -1,11 +1,12 @@
 """
 Login page object for Hometax authentication.
 """
-import asyncio
+import re
+import time
 from typing import Optional
 
 import structlog
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
+from playwright.async_api import Frame, Page, TimeoutError as PlaywrightTimeout
 
 from ..constants import (
     AUTH_CERT,
@@ -15,9 +16,13 @@ from ..constants import (
     SELECTORS,
     TIMEOUTS,
 )
+from .common import wait_until_settled
 
 logger = structlog.get_logger()
 
+# Matches any known Hometax error alert message
+_ERROR_RE = re.compile("|".join(map(re.escape, ERROR_MESSAGES.values())))
+
 
 class LoginPage:
     """
@@ -30,10 +35,21 @@ class LoginPage:
         """Initialize login page with Playwright page instance."""
         self.page = page
         self.log = logger.bind(component="LoginPage")
+        # time.monotonic() of the last confirmed login; trusted for _login_ttl
+        # seconds and dropped on any main-frame navigation
+        self._login_confirmed_at: Optional[float] = None
+        self._login_ttl = 5.0
+        page.on("framenavigated", self._on_frame_navigated)
+
+    def _on_frame_navigated(self, frame: Frame) -> None:
+        """Forget the login confirmation when the page navigates."""
+        if frame == self.page.main_frame:
+            self._login_confirmed_at = None
 
     async def navigate(self) -> None:
         """Navigate to Hometax main page."""
         self.log.info("navigating_to_hometax")
+        self._login_confirmed_at = None
         await self.page.goto(HOMETAX_MAIN_URL, timeout=TIMEOUTS["page_load"])
         await self.page.wait_for_load_state("networkidle")
         self.log.info("navigation_complete")
@@ -160,7 +176,7 @@ class LoginPage:
             pass
 
         # Additional wait for animations
-        await asyncio.sleep(TIMEOUTS["animation"] / 1000)
+        await wait_until_settled(self.page)
 
     async def _check_login_success(self) -> bool:
         """Check if login was successful."""
@@ -169,22 +185,29 @@ class LoginPage:
             alert = await self.page.query_selector(SELECTORS["alert_popup"])
             if alert:
                 alert_text = await alert.text_content()
-                if any(msg in alert_text for msg in ERROR_MESSAGES.values()):
+                if alert_text and _ERROR_RE.search(alert_text):
                     self.log.warning("login_error_alert", message=alert_text)
                     return False
 
             # Check for logged-in state (user info visible)
             # This selector varies based on Hometax UI version
             user_info = await self.page.query_selector(".user_info, #userInfo, .login_user")
-            return user_info is not None
+            if user_info is None:
+                self._login_confirmed_at = None
+                return False
+
+            self._login_confirmed_at = time.monotonic()
+            return True
 
         except Exception as e:
             self.log.error("check_login_error", error=str(e))
+            self._login_confirmed_at = None
             return False
 
     async def logout(self) -> None:
         """Logout from Hometax."""
         self.log.info("logout_started")
+        self._login_confirmed_at = None
         try:
             logout_btn = await self.page.query_selector(".logout_btn, #logout, [title='로그아웃']")
             if logout_btn:
@@ -209,6 +232,27 @@ class LoginPage:
             return None
 
     async def is_logged_in(self) -> bool:
-        """Check if currently logged in."""
-        user_info = await self.page.query_selector(".user_info, #userInfo, .login_user")
-        return user_info is not None
+        """
+        Check if currently logged in.
+
+        A confirmation is reused for up to _login_ttl (5) seconds while the
+        page stays put, so a server-side logout inside that window is only
+        noticed by the next check after it.
+        """
+        if (
+            self._login_confirmed_at is not None
+            and time.monotonic() - self._login_confirmed_at < self._login_ttl
+        ):
+            return True
+
+        try:
+            user_info = await self.page.query_selector(".user_info, #userInfo, .login_user")
+        except Exception:
+            self._login_confirmed_at = None
+            raise
+        if user_info is None:
+            self._login_confirmed_at = None
+            return False
+
+        self._login_confirmed_at = time.monotonic()
+        return True
@@ -2,6 +2,8 @@
 Tax invoice search page object.
 """
 import asyncio
+import time
+from collections import OrderedDict
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
@@ -10,25 +12,86 @@ import structlog
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeout
 
 from ..constants import (
+    ELEMENT_VALUE_JS,
     MENU_TAX_INVOICE_SEARCH,
     SELECTORS,
     STATUS_MAP,
     TIMEOUTS,
 )
 from ..models import InvoiceType, TaxInvoice
+from .common import wait_until_settled, yyyymmdd
 
 logger = structlog.get_logger()
 
+# Seconds a parsed invoice detail is served from cache; status and NTS
+# confirmation change after issue, so details must not live forever
+_DETAIL_CACHE_TTL = 300.0
+
+# Returns the trimmed text of every cell of every matching row in one call
+_EXTRACT_ROWS_JS = """(sel) => Array.from(document.querySelectorAll(sel)).map(
+    (r) => Array.from(r.querySelectorAll('td')).map((c) => (c.textContent || '').trim())
+)"""
+
+
+def _parse_dashed_date(value: str) -> datetime:
+    """Parse a YYYY-MM-DD string without going through strptime.
+
+    Raises:
+        ValueError: If the string is not in YYYY-MM-DD form
+    """
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(f"time data {value!r} does not match format '%Y-%m-%d'")
+    return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
 
 class TaxInvoiceSearchPage:
     """
     Page object for tax invoice search operations.
     """
 
-    def __init__(self, page: Page) -> None:
-        """Initialize search page with Playwright page instance."""
+    def __init__(
+        self,
+        page: Page,
+        max_cache: int = 128,
+        cache_ttl: float = _DETAIL_CACHE_TTL,
+    ) -> None:
+        """Initialize search page with Playwright page instance.
+
+        Args:
+            page: Playwright page
+            max_cache: Number of invoice details to keep (0 disables caching)
+            cache_ttl: Seconds a cached invoice detail stays valid
+        """
         self.page = page
         self.log = logger.bind(component="TaxInvoiceSearchPage")
+        # (time.monotonic() when parsed, detail) by invoice number, least
+        # recently used first
+        self._detail_cache: OrderedDict[str, tuple[float, TaxInvoice]] = OrderedDict()
+        self._max_cache = max_cache
+        self._cache_ttl = cache_ttl
+
+    def set_cache_size(self, size: int) -> None:
+        """
+        Resize the invoice detail cache.
+
+        Args:
+            size: Maximum number of cached details; 0 disables the cache
+        """
+        self._max_cache = max(size, 0)
+        while len(self._detail_cache) > self._max_cache:
+            self._detail_cache.popitem(last=False)
+
+    def invalidate(self, invoice_number: Optional[str] = None) -> None:
+        """
+        Drop cached invoice details.
+
+        Args:
+            invoice_number: Invoice to forget; None clears the whole cache
+        """
+        if invoice_number is None:
+            self._detail_cache.clear()
+        else:
+            self._detail_cache.pop(invoice_number, None)
 
     async def navigate(self, invoice_type: InvoiceType = InvoiceType.SALES) -> None:
         """
@@ -97,8 +160,8 @@ class TaxInvoiceSearchPage:
 
     async def _set_date_range(self, start_date: date, end_date: date) -> None:
         """Set search date range."""
-        start_str = start_date.strftime("%Y%m%d")
-        end_str = end_date.strftime("%Y%m%d")
+        start_str = yyyymmdd(start_date)
+        end_str = yyyymmdd(end_date)
 
         await self.page.fill(SELECTORS["search_start_date"], start_str)
         await self.page.fill(SELECTORS["search_end_date"], end_str)
@@ -120,10 +183,11 @@ class TaxInvoiceSearchPage:
                 timeout=TIMEOUTS["element_wait"],
             )
 
-            rows = await self.page.query_selector_all(SELECTORS["result_rows"])
+            # Pull the whole table in one round-trip; parsing is then pure Python
+            rows = await self.page.evaluate(_EXTRACT_ROWS_JS, SELECTORS["result_rows"])
 
-            for row in rows:
-                invoice = await self._parse_row(row)
+            for cells in rows:
+                invoice = self._row_to_invoice(cells)
                 if invoice:
                     invoices.append(invoice)
 
@@ -134,27 +198,26 @@ class TaxInvoiceSearchPage:
 
         return invoices
 
-    async def _parse_row(self, row) -> Optional[TaxInvoice]:
-        """Parse a single result row into TaxInvoice."""
+    def _row_to_invoice(self, cells: list[str]) -> Optional[TaxInvoice]:
+        """Parse the cell texts of a single result row into TaxInvoice."""
         try:
-            cells = await row.query_selector_all("td")
             if len(cells) < 8:
                 return None
 
-            # Extract cell values (order depends on Hometax table structure)
-            invoice_number = await self._get_cell_text(cells[0])
-            issue_date_str = await self._get_cell_text(cells[1])
-            supplier_brn = await self._get_cell_text(cells[2])
-            supplier_name = await self._get_cell_text(cells[3])
-            buyer_brn = await self._get_cell_text(cells[4])
-            buyer_name = await self._get_cell_text(cells[5])
-            supply_amount_str = await self._get_cell_text(cells[6])
-            tax_amount_str = await self._get_cell_text(cells[7])
-            status_code = await self._get_cell_text(cells[8]) if len(cells) > 8 else "04"
-            nts_confirm = await self._get_cell_text(cells[9]) if len(cells) > 9 else ""
+            # Cell values (order depends on Hometax table structure)
+            invoice_number = cells[0]
+            issue_date_str = cells[1]
+            supplier_brn = cells[2]
+            supplier_name = cells[3]
+            buyer_brn = cells[4]
+            buyer_name = cells[5]
+            supply_amount_str = cells[6]
+            tax_amount_str = cells[7]
+            status_code = cells[8] if len(cells) > 8 else "04"
+            nts_confirm = cells[9] if len(cells) > 9 else ""
 
             # Parse date
-            issue_date = datetime.strptime(issue_date_str, "%Y-%m-%d")
+            issue_date = _parse_dashed_date(issue_date_str)
 
             # Parse amounts
             supply_amount = Decimal(supply_amount_str.replace(",", ""))
@@ -179,11 +242,6 @@ class TaxInvoiceSearchPage:
             self.log.warning("parse_row_error", error=str(e))
             return None
 
-    async def _get_cell_text(self, cell) -> str:
-        """Get text content from a table cell."""
-        text = await cell.text_content()
-        return text.strip() if text else ""
-
     async def get_invoice_detail(self, invoice_number: str) -> Optional[TaxInvoice]:
         """
         Get detailed information for a specific invoice.
@@ -194,6 +252,14 @@ class TaxInvoiceSearchPage:
         Returns:
             TaxInvoice with full details
         """
+        cached = self._detail_cache.get(invoice_number)
+        if cached is not None:
+            if time.monotonic() - cached[0] <= self._cache_ttl:
+                self._detail_cache.move_to_end(invoice_number)
+                self.log.debug("invoice_detail_cache_hit", invoice_number=invoice_number)
+                return cached[1]
+            del self._detail_cache[invoice_number]
+
         self.log.info("get_invoice_detail", invoice_number=invoice_number)
 
         try:
@@ -207,6 +273,10 @@ class TaxInvoiceSearchPage:
 
             # Parse detail page
             invoice = await self._parse_detail_page()
+            if invoice is not None and self._max_cache > 0:
+                self._detail_cache[invoice_number] = (time.monotonic(), invoice)
+                if len(self._detail_cache) > self._max_cache:
+                    self._detail_cache.popitem(last=False)
             return invoice
 
         except Exception as e:
@@ -216,17 +286,29 @@ class TaxInvoiceSearchPage:
     async def _parse_detail_page(self) -> Optional[TaxInvoice]:
         """Parse tax invoice detail page."""
         try:
-            invoice_number = await self._get_element_value(SELECTORS["invoice_number"])
-            issue_date_str = await self._get_element_value(SELECTORS["issue_date"])
-            supplier_brn = await self._get_element_value(SELECTORS["supplier_brn"])
-            supplier_name = await self._get_element_value(SELECTORS["supplier_name"])
-            buyer_brn = await self._get_element_value(SELECTORS["buyer_brn"])
-            buyer_name = await self._get_element_value(SELECTORS["buyer_name"])
-            supply_amount_str = await self._get_element_value(SELECTORS["supply_amount"])
-            tax_amount_str = await self._get_element_value(SELECTORS["tax_amount"])
-            nts_confirm = await self._get_element_value(SELECTORS["nts_confirm"])
-
-            issue_date = datetime.strptime(issue_date_str, "%Y-%m-%d")
+            (
+                invoice_number,
+                issue_date_str,
+                supplier_brn,
+                supplier_name,
+                buyer_brn,
+                buyer_name,
+                supply_amount_str,
+                tax_amount_str,
+                nts_confirm,
+            ) = await asyncio.gather(
+                self._get_element_value(SELECTORS["invoice_number"]),
+                self._get_element_value(SELECTORS["issue_date"]),
+                self._get_element_value(SELECTORS["supplier_brn"]),
+                self._get_element_value(SELECTORS["supplier_name"]),
+                self._get_element_value(SELECTORS["buyer_brn"]),
+                self._get_element_value(SELECTORS["buyer_name"]),
+                self._get_element_value(SELECTORS["supply_amount"]),
+                self._get_element_value(SELECTORS["tax_amount"]),
+                self._get_element_value(SELECTORS["nts_confirm"]),
+            )
+
+            issue_date = _parse_dashed_date(issue_date_str)
             supply_amount = Decimal(supply_amount_str.replace(",", ""))
             tax_amount = Decimal(tax_amount_str.replace(",", ""))
 
@@ -251,16 +333,7 @@ class TaxInvoiceSearchPage:
 
     async def _get_element_value(self, selector: str) -> str:
         """Get value from form element or text from span."""
-        element = await self.page.query_selector(selector)
-        if not element:
-            return ""
-
-        tag = await element.evaluate("el => el.tagName")
-        if tag.lower() in ("input", "select"):
-            return await element.input_value() or ""
-        else:
-            text = await element.text_content()
-            return text.strip() if text else ""
+        return await self.page.evaluate(ELEMENT_VALUE_JS, selector)
 
     async def _wait_for_loading(self) -> None:
         """Wait for loading indicator to disappear."""
@@ -272,4 +345,4 @@ class TaxInvoiceSearchPage:
             )
         except PlaywrightTimeout:
             pass
-        await asyncio.sleep(TIMEOUTS["animation"] / 1000)
+        await wait_until_settled(self.page)
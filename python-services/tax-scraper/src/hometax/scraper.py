@@ -4,14 +4,28 @@ Hometax Web Scraper using Playwright
 Handles authentication and tax invoice operations with Korean National Tax Service.
 """
 import asyncio
+import hashlib
+import time
 import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import structlog
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from playwright.async_api import (
+    async_playwright,
+    Browser,
+    BrowserContext,
+    Page,
+    Route,
+    StorageState,
+)
 
 from config import get_settings
+from .constants import BLOCKED_RESOURCE_TYPES, BLOCKED_URL_KEYWORDS, HOMETAX_URL_PATTERN
+from .context_pool import ContextPool
+from .pages.login import LoginPage
 from .models import (
     AuthType,
     HometaxSession,
@@ -22,6 +36,43 @@ from .models import (
 
 logger = structlog.get_logger()
 
+# Session contexts are rotated after this many operations or seconds, since
+# Chromium's per-context heap grows steadily on the websquare pages
+_MAX_OPS_PER_CONTEXT = 50
+_MAX_CONTEXT_AGE = 300.0
+
+# Logged-in storage_state snapshots are reused for this many seconds
+_STORAGE_STATE_TTL = 1800.0
+
+# Chromium flags that trim per-process memory in containers
+_BROWSER_ARGS = ["--disable-dev-shm-usage", "--disable-gpu"]
+
+
+async def block_unneeded_resources(route: Route) -> None:
+    """Abort images, fonts, media and analytics requests; let the rest through.
+
+    Register it for HOMETAX_URL_PATTERN only, so third-party login and
+    certificate resources are always loaded.
+    """
+    request = route.request
+    url = request.url
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(k in url for k in BLOCKED_URL_KEYWORDS):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+@dataclass
+class _SessionContext:
+    """Browser context bound to a login session, with rotation counters."""
+
+    context: BrowserContext
+    created_at: float = field(default_factory=time.monotonic)
+    op_count: int = 0
+    pooled: bool = True  # Return to the context pool on logout
+    page: Optional[Page] = None  # Kept open so websquare stays loaded between calls
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)  # One operation at a time
+
 
 class HometaxScraper:
     """
@@ -36,7 +87,21 @@ class HometaxScraper:
         self.settings = get_settings()
         self.log = logger.bind(component="HometaxScraper")
         self._browser: Optional[Browser] = None
-        self._sessions: dict[str, BrowserContext] = {}
+        self._sessions: dict[str, _SessionContext] = {}
+        # Logged-in storage_state by credential fingerprint: (taken_at, state)
+        self._storage_states: dict[str, tuple[float, StorageState]] = {}
+        # Ready-made contexts, one per concurrent browser operation
+        self._context_pool = ContextPool(
+            self._create_context, size=self.settings.browser_context_pool_size
+        )
+        # In-flight invoice queries by (session_id, start, end, type)
+        self._inflight: dict[tuple, asyncio.Task[list[TaxInvoice]]] = {}
+        # Caps concurrent browser work at the pool size; all calls share the gRPC loop
+        self._browser_slots = asyncio.Semaphore(self.settings.browser_context_pool_size)
+
+    async def start(self) -> None:
+        """Launch the browser and pre-warm the context pool."""
+        await self._context_pool.start()
 
     async def _get_browser(self) -> Browser:
         """Get or create browser instance."""
@@ -45,14 +110,16 @@ class HometaxScraper:
             self._browser = await playwright.chromium.launch(
                 headless=self.settings.browser_headless,
                 slow_mo=self.settings.browser_slow_mo,
+                args=_BROWSER_ARGS,
             )
             self.log.info("browser_launched", headless=self.settings.browser_headless)
         return self._browser
 
-    async def _create_context(self) -> BrowserContext:
+    async def _create_context(self, storage_state: Optional[StorageState] = None) -> BrowserContext:
         """Create a new browser context with Korean locale."""
         browser = await self._get_browser()
         context = await browser.new_context(
+            storage_state=storage_state,
             locale="ko-KR",
             timezone_id="Asia/Seoul",
             viewport={"width": 1920, "height": 1080},
@@ -62,6 +129,7 @@ class HometaxScraper:
                 "Chrome/120.0.0.0 Safari/537.36"
             ),
         )
+        await context.route(HOMETAX_URL_PATTERN, block_unneeded_resources)
         return context
 
     async def login(
@@ -87,54 +155,114 @@ class HometaxScraper:
         """
         self.log.info("login_started", auth_type=auth_type)
 
-        context = await self._create_context()
-        page = await context.new_page()
+        auth_type_enum = AuthType(auth_type)
+        state_key = self._storage_state_key(
+            business_number, auth_type, cert_password, user_id, password
+        )
+
+        async with self._browser_slots:
+            # A recent snapshot for the same credentials skips the login flow
+            context = await self._restore_login(state_key)
+            pooled = context is None
+            if context is None:
+                context = await self._context_pool.acquire()
+            page = context.pages[0] if context.pages else await context.new_page()
+
+            try:
+                if pooled:
+                    # Navigate to Hometax login page
+                    await page.goto(
+                        f"{self.settings.hometax_base_url}/websquare/websquare.wq",
+                        timeout=self.settings.browser_timeout,
+                    )
+
+                    if auth_type_enum == AuthType.CERTIFICATE:
+                        await self._login_with_certificate(page, business_number, cert_password)
+                    elif auth_type_enum == AuthType.ID_PASSWORD:
+                        await self._login_with_credentials(page, user_id, password)
+                    else:
+                        raise ValueError(f"Unsupported auth type: {auth_type}")
+
+                    # Snapshots of other logins that have expired are dropped here
+                    now = time.monotonic()
+                    for stale in [
+                        k for k, (at, _) in self._storage_states.items() if now - at > _STORAGE_STATE_TTL
+                    ]:
+                        del self._storage_states[stale]
+                    self._storage_states[state_key] = (now, await context.storage_state())
+
+                # Generate session ID
+                session_id = str(uuid.uuid4())
+
+                # Store context for later use
+                self._sessions[session_id] = _SessionContext(context, pooled=pooled, page=page)
+
+                # Get company name from page (after login)
+                company_name = await self._get_company_name(page)
+
+                session = HometaxSession(
+                    session_id=session_id,
+                    business_number=business_number,
+                    company_name=company_name,
+                    expires_at=datetime.now() + timedelta(hours=1),
+                    auth_type=auth_type_enum,
+                )
+
+                self.log.info(
+                    "login_success",
+                    session_id=session_id[:8] + "...",
+                    company_name=company_name,
+                )
+
+                return session
+
+            except Exception as e:
+                if pooled:
+                    await self._context_pool.release(context)
+                else:
+                    await context.close()
+                self.log.error("login_failed", error=str(e))
+                raise
+
+    @staticmethod
+    def _storage_state_key(*credentials: Optional[str]) -> str:
+        """Fingerprint login credentials so snapshots are only reused by their owner."""
+        return hashlib.sha256("\0".join(c or "" for c in credentials).encode("utf-8")).hexdigest()
+
+    async def _restore_login(self, state_key: str) -> Optional[BrowserContext]:
+        """
+        Open a context from a cached logged-in storage_state.
+
+        Args:
+            state_key: Credential fingerprint from _storage_state_key()
 
+        Returns:
+            Logged-in context, or None if there is no usable snapshot
+        """
+        cached = self._storage_states.get(state_key)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] > _STORAGE_STATE_TTL:
+            del self._storage_states[state_key]
+            return None
+
+        context = await self._create_context(storage_state=cached[1])
         try:
-            # Navigate to Hometax login page
+            page = await context.new_page()
             await page.goto(
                 f"{self.settings.hometax_base_url}/websquare/websquare.wq",
                 timeout=self.settings.browser_timeout,
             )
-
-            auth_type_enum = AuthType(auth_type)
-
-            if auth_type_enum == AuthType.CERTIFICATE:
-                await self._login_with_certificate(page, business_number, cert_password)
-            elif auth_type_enum == AuthType.ID_PASSWORD:
-                await self._login_with_credentials(page, user_id, password)
-            else:
-                raise ValueError(f"Unsupported auth type: {auth_type}")
-
-            # Generate session ID
-            session_id = str(uuid.uuid4())
-
-            # Store context for later use
-            self._sessions[session_id] = context
-
-            # Get company name from page (after login)
-            company_name = await self._get_company_name(page)
-
-            session = HometaxSession(
-                session_id=session_id,
-                business_number=business_number,
-                company_name=company_name,
-                expires_at=datetime.now() + timedelta(hours=1),
-                auth_type=auth_type_enum,
-            )
-
-            self.log.info(
-                "login_success",
-                session_id=session_id[:8] + "...",
-                company_name=company_name,
-            )
-
-            return session
-
+            if await LoginPage(page).is_logged_in():
+                self.log.info("login_restored")
+                return context
         except Exception as e:
-            await context.close()
-            self.log.error("login_failed", error=str(e))
-            raise
+            self.log.warning("login_restore_failed", error=str(e))
+
+        # Server-side session ended; fall back to a full login
+        self._storage_states.pop(state_key, None)
+        await context.close()
+        return None
 
     async def _login_with_certificate(
         self,
@@ -151,7 +279,6 @@ class HometaxScraper:
         # 1. Certificate file parsing
         # 2. SEED encryption for certificate password
         # 3. NTS authentication protocol
-        await asyncio.sleep(1)  # Simulated delay
 
     async def _login_with_credentials(
         self,
@@ -174,7 +301,50 @@ class HometaxScraper:
         # Wait for login to complete
         # await page.wait_for_url('**/main*', timeout=30000)
 
-        await asyncio.sleep(1)  # Simulated delay
+    @asynccontextmanager
+    async def _session_page(self, session_id: str) -> AsyncIterator[Page]:
+        """
+        Hold the working page of a session for one operation.
+
+        Operations on a session run one at a time, each within a browser slot.
+        A context that has served _MAX_OPS_PER_CONTEXT operations or is older
+        than _MAX_CONTEXT_AGE is replaced by a fresh one carrying over its
+        cookies and local storage, so the login stays valid.
+
+        Args:
+            session_id: Active session ID
+
+        Yields:
+            Page to run the operation on
+        """
+        entry = self._sessions.get(session_id)
+        if not entry:
+            raise ValueError("Invalid or expired session")
+
+        async with entry.lock, self._browser_slots:
+            # Logged out while waiting for the lock
+            if self._sessions.get(session_id) is not entry:
+                raise ValueError("Invalid or expired session")
+
+            entry.op_count += 1
+            if (
+                entry.op_count > _MAX_OPS_PER_CONTEXT
+                or time.monotonic() - entry.created_at > _MAX_CONTEXT_AGE
+            ):
+                state = await entry.context.storage_state()
+                context = await self._create_context(storage_state=state)
+                await self._close_session_context(entry)
+                entry.context = context
+                entry.created_at = time.monotonic()
+                entry.op_count = 1
+                entry.pooled = False
+                entry.page = None
+                self.log.info("session_context_rotated", session_id=session_id[:8] + "...")
+
+            if entry.page is None or entry.page.is_closed():
+                context = entry.context
+                entry.page = context.pages[0] if context.pages else await context.new_page()
+            yield entry.page
 
     async def _get_company_name(self, page: Page) -> str:
         """Extract company name from logged-in page."""
@@ -191,6 +361,10 @@ class HometaxScraper:
         """
         Retrieve tax invoices from Hometax.
 
+        Concurrent identical queries share one in-flight scrape; finished
+        results are not kept. The scrape runs in its own task, so a
+        cancelled caller does not abort it for the others.
+
         Args:
             session_id: Active session ID
             start_date: Start date (YYYY-MM-DD)
@@ -200,6 +374,38 @@ class HometaxScraper:
         Returns:
             List of tax invoices
         """
+        key = (session_id, start_date, end_date, invoice_type)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._scrape_invoices(key, session_id, start_date, end_date))
+            # Retrieved here, so no warning if every caller was cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        else:
+            self.log.debug("get_invoices_coalesced", session_id=session_id[:8] + "...")
+        return list(await asyncio.shield(task))
+
+    async def _scrape_invoices(
+        self,
+        key: tuple,
+        session_id: str,
+        start_date: str,
+        end_date: str,
+    ) -> list[TaxInvoice]:
+        """Run a shared invoice query, then let the next one scrape again."""
+        try:
+            return await self._fetch_tax_invoices(session_id, start_date, end_date)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _fetch_tax_invoices(
+        self,
+        session_id: str,
+        start_date: str,
+        end_date: str,
+    ) -> list[TaxInvoice]:
+        """Run one invoice query in the session's browser page."""
         self.log.info(
             "get_invoices_started",
             session_id=session_id[:8] + "...",
@@ -207,34 +413,29 @@ class HometaxScraper:
             end_date=end_date,
         )
 
-        context = self._sessions.get(session_id)
-        if not context:
-            raise ValueError("Invalid or expired session")
+        async with self._session_page(session_id) as page:
+            invoices: list[TaxInvoice] = []
 
-        page = context.pages[0] if context.pages else await context.new_page()
+            try:
+                # Navigate to tax invoice query page
+                # await page.goto(f"{self.settings.hometax_base_url}/...")
 
-        invoices: list[TaxInvoice] = []
-
-        try:
-            # Navigate to tax invoice query page
-            # await page.goto(f"{self.settings.hometax_base_url}/...")
+                # Set search criteria
+                # await page.fill('#start_date', start_date)
+                # await page.fill('#end_date', end_date)
 
-            # Set search criteria
-            # await page.fill('#start_date', start_date)
-            # await page.fill('#end_date', end_date)
+                # Execute search
+                # await page.click('button#search')
 
-            # Execute search
-            # await page.click('button#search')
+                # Parse results
+                # TODO: Implement actual scraping logic
 
-            # Parse results
-            # TODO: Implement actual scraping logic
+                self.log.info("get_invoices_success", count=len(invoices))
+                return invoices
 
-            self.log.info("get_invoices_success", count=len(invoices))
-            return invoices
-
-        except Exception as e:
-            self.log.error("get_invoices_failed", error=str(e))
-            raise
+            except Exception as e:
+                self.log.error("get_invoices_failed", error=str(e))
+                raise
 
     async def issue_tax_invoice(
         self,
@@ -257,44 +458,39 @@ class HometaxScraper:
             buyer=invoice_data.get("buyer_business_number", "")[:6] + "****",
         )
 
-        context = self._sessions.get(session_id)
-        if not context:
-            raise ValueError("Invalid or expired session")
+        async with self._session_page(session_id) as page:
+            try:
+                # Navigate to tax invoice issuance page
+                # await page.goto(f"{self.settings.hometax_base_url}/...")
 
-        page = context.pages[0] if context.pages else await context.new_page()
+                # Fill invoice form
+                # await page.fill('#buyer_business_number', invoice_data['buyer_business_number'])
+                # await page.fill('#buyer_name', invoice_data['buyer_name'])
+                # await page.fill('#supply_amount', str(invoice_data['supply_amount']))
+                # ...
 
-        try:
-            # Navigate to tax invoice issuance page
-            # await page.goto(f"{self.settings.hometax_base_url}/...")
-
-            # Fill invoice form
-            # await page.fill('#buyer_business_number', invoice_data['buyer_business_number'])
-            # await page.fill('#buyer_name', invoice_data['buyer_name'])
-            # await page.fill('#supply_amount', str(invoice_data['supply_amount']))
-            # ...
-
-            # Submit invoice
-            # await page.click('button#issue')
-
-            # Get confirmation
-            # TODO: Implement actual issuance logic
-
-            result = IssuedInvoiceResult(
-                success=True,
-                invoice_number="20240115-12345678",
-                issue_date=datetime.now(),
-                nts_confirm_number="NTS-CONFIRM-12345",
-            )
+                # Submit invoice
+                # await page.click('button#issue')
 
-            self.log.info(
-                "issue_invoice_success",
-                invoice_number=result.invoice_number,
-            )
-            return result
+                # Get confirmation
+                # TODO: Implement actual issuance logic
 
-        except Exception as e:
-            self.log.error("issue_invoice_failed", error=str(e))
-            raise
+                result = IssuedInvoiceResult(
+                    success=True,
+                    invoice_number="20240115-12345678",
+                    issue_date=datetime.now(),
+                    nts_confirm_number="NTS-CONFIRM-12345",
+                )
+
+                self.log.info(
+                    "issue_invoice_success",
+                    invoice_number=result.invoice_number,
+                )
+                return result
+
+            except Exception as e:
+                self.log.error("issue_invoice_failed", error=str(e))
+                raise
 
     async def logout(self, session_id: str) -> None:
         """
@@ -305,21 +501,38 @@ class HometaxScraper:
         """
         self.log.info("logout_started", session_id=session_id[:8] + "...")
 
-        context = self._sessions.pop(session_id, None)
-        if context:
-            await context.close()
+        entry = self._sessions.pop(session_id, None)
+        if entry:
+            # Let an in-flight operation finish before its context goes away
+            async with entry.lock:
+                await self._close_session_context(entry)
             self.log.info("logout_success")
         else:
             self.log.warning("logout_session_not_found")
 
+    async def _close_session_context(self, entry: _SessionContext) -> None:
+        """Close a session's context, returning pooled ones through the pool to refill it."""
+        if entry.pooled:
+            await self._context_pool.release(entry.context)
+        else:
+            await entry.context.close()
+
     async def close(self) -> None:
         """Close all sessions and browser."""
         self.log.info("closing_scraper")
 
-        # Close all sessions
-        for session_id, context in list(self._sessions.items()):
-            await context.close()
+        # Stop shared scrapes before their contexts go away
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Close all sessions, each once its current operation is done
+        for session_id, entry in list(self._sessions.items()):
             del self._sessions[session_id]
+            async with entry.lock:
+                await self._close_session_context(entry)
+        await self._context_pool.close()
 
         # Close browser
         if self._browser and self._browser.is_connected():
@@ -7,18 +7,24 @@ import asyncio
 import logging
 import signal
 import sys
-from concurrent import futures
 
 import grpc
+import orjson
 import structlog
 from grpc_health.v1 import health, health_pb2, health_pb2_grpc
 from grpc_reflection.v1alpha import reflection
 
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(__file__).rsplit("/", 2)[0])
 
 from config import get_settings
-from src.server import TaxInvoiceServicer
+from src.server import REFLECTION_SERVICE_NAMES, TAX_SERVICE_NAME, TaxInvoiceServicer
+from src.services.tax_service import TaxInvoiceService
 
 # Generated proto imports (will be available after proto generation)
 try:
@@ -32,6 +38,7 @@ logger = structlog.get_logger()
 
 def configure_logging(settings) -> None:
     """Configure structured logging."""
+    json_logs = settings.log_format == "json"
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
@@ -40,8 +47,8 @@ def configure_logging(settings) -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             (
-                structlog.processors.JSONRenderer()
-                if settings.log_format == "json"
+                structlog.processors.JSONRenderer(serializer=orjson.dumps)
+                if json_logs
                 else structlog.dev.ConsoleRenderer()
             ),
         ],
@@ -49,7 +56,10 @@ def configure_logging(settings) -> None:
             getattr(logging, settings.log_level.upper(), logging.INFO)
         ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        # orjson renders bytes, which BytesLogger writes without decoding
+        logger_factory=(
+            structlog.BytesLoggerFactory() if json_logs else structlog.PrintLoggerFactory()
+        ),
         cache_logger_on_first_use=True,
     )
 
@@ -62,17 +72,25 @@ async def serve() -> None:
     log = logger.bind(service=settings.service_name, version=settings.service_version)
 
     # Create gRPC server
+    # Handlers are coroutines on this loop, so no thread pool is needed
     server = grpc.aio.server(
-        futures.ThreadPoolExecutor(max_workers=settings.grpc_max_workers),
         options=[
             ("grpc.max_send_message_length", 50 * 1024 * 1024),
             ("grpc.max_receive_message_length", 50 * 1024 * 1024),
         ],
     )
 
+    # One service per process, shared by the servicers as in src/server.py
+    service = TaxInvoiceService()
+    tax_invoice_servicer = TaxInvoiceServicer(service)
+    try:
+        await tax_invoice_servicer.start()
+    except Exception as e:
+        # Contexts are still created on demand if pre-warming fails
+        log.warning("browser_prewarm_failed", error=str(e))
+
     # Register tax invoice service
     if tax_pb2_grpc:
-        tax_invoice_servicer = TaxInvoiceServicer()
         tax_pb2_grpc.add_TaxInvoiceServiceServicer_to_server(tax_invoice_servicer, server)
         log.info("tax_invoice_service_registered")
 
@@ -81,21 +99,12 @@ async def serve() -> None:
     health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
     health_servicer.set("", health_pb2.HealthCheckResponse.SERVING)
     if tax_pb2:
-        health_servicer.set(
-            tax_pb2.DESCRIPTOR.services_by_name["TaxInvoiceService"].full_name,
-            health_pb2.HealthCheckResponse.SERVING,
-        )
+        health_servicer.set(TAX_SERVICE_NAME, health_pb2.HealthCheckResponse.SERVING)
     log.info("health_service_registered")
 
     # Enable reflection for development
     if settings.grpc_reflection_enabled:
-        service_names = [
-            reflection.SERVICE_NAME,
-            health_pb2.DESCRIPTOR.services_by_name["Health"].full_name,
-        ]
-        if tax_pb2:
-            service_names.append(tax_pb2.DESCRIPTOR.services_by_name["TaxInvoiceService"].full_name)
-        reflection.enable_server_reflection(service_names, server)
+        reflection.enable_server_reflection(REFLECTION_SERVICE_NAMES, server)
         log.info("grpc_reflection_enabled")
 
     # Start server
@@ -124,12 +133,16 @@ async def serve() -> None:
     # Graceful shutdown
     log.info("initiating_graceful_shutdown")
     await server.stop(grace=5)
+    await tax_invoice_servicer.close()
     log.info("grpc_server_stopped")
 
 
 def main() -> None:
     """Main entry point."""
-    asyncio.run(serve())
+    if uvloop is not None:
+        uvloop.run(serve())
+    else:
+        asyncio.run(serve())
 
 
 if __name__ == "__main__":
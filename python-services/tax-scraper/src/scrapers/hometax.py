@@ -2,15 +2,116 @@
 
 import asyncio
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date
 from enum import Enum
+from types import SimpleNamespace
 from typing import Any
 
 from loguru import logger
-from playwright.async_api import Browser, Page, Playwright, async_playwright
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+from playwright.async_api import TimeoutError as PlaywrightTimeout
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from config.settings import get_settings
+from src.hometax.constants import HOMETAX_URL_PATTERN
+from src.hometax.scraper import block_unneeded_resources
+
+# Trimmed <td> texts of every row matching the selector argument
+_TABLE_TEXT_JS = """(sel) => Array.from(document.querySelectorAll(sel), (r) =>
+    Array.from(r.querySelectorAll('td'), (c) => (c.textContent || '').trim())
+)"""
+
+# Elements whose appearance marks a step as done, used instead of networkidle
+_LOGIN_MENU_MARKER = 'a:has-text("아이디 로그인"), a:has-text("공동인증서")'
+_LOGGED_IN_MARKER = 'a:has-text("로그아웃")'
+_RESULT_TABLE_MARKER = "table.result"
+_MARKER_TIMEOUT = 5000  # ms
+
+
+@dataclass(slots=True)
+class _SharedBrowser:
+    """Chromium shared by every HometaxScraper on one event loop."""
+
+    loop: asyncio.AbstractEventLoop
+    lock: asyncio.Lock
+    playwright: Playwright | None = None
+    browser: Browser | None = None
+
+
+# Playwright objects and asyncio.Lock are bound to the loop that created them,
+# so the shared state is replaced when a different loop asks for it
+_shared: _SharedBrowser | None = None
+
+
+def _shared_state() -> _SharedBrowser:
+    """Return the shared browser state of the running event loop."""
+    global _shared
+
+    loop = asyncio.get_running_loop()
+    if _shared is None or _shared.loop is not loop:
+        _shared = _SharedBrowser(loop=loop, lock=asyncio.Lock())
+    return _shared
+
+
+async def _get_shared_browser() -> Browser:
+    """Return the process-wide browser, launching it on first use."""
+    state = _shared_state()
+
+    async with state.lock:
+        if state.browser is None or not state.browser.is_connected():
+            settings = get_settings()
+            logger.info("Starting Playwright browser...")
+            if state.playwright is None:
+                state.playwright = await async_playwright().start()
+            state.browser = await state.playwright.chromium.launch(
+                headless=settings.browser_headless,
+                slow_mo=settings.browser_slow_mo,
+            )
+            logger.info("Browser started successfully")
+        return state.browser
+
+
+def _build_locators(page: Page) -> SimpleNamespace:
+    """Build the locators used by login and search once per page.
+
+    Locators are lazy, so they can be built before navigation; .first keeps
+    the first-match behaviour of page.click/fill for ambiguous selectors.
+    """
+    return SimpleNamespace(
+        login_menu=page.locator(_LOGIN_MENU_MARKER).first,
+        cert_tab=page.locator('a:has-text("공동인증서")').first,
+        id_tab=page.locator('a:has-text("아이디 로그인")').first,
+        user_id=page.locator('input[name="userId"]').first,
+        user_pwd=page.locator('input[name="userPwd"]').first,
+        login_btn=page.locator('button:has-text("로그인")').first,
+        logout=page.locator(_LOGGED_IN_MARKER).first,
+        sales_radio=page.locator('input[value="01"]').first,
+        purchase_radio=page.locator('input[value="02"]').first,
+        start_dt=page.locator('input[name="startDt"]').first,
+        end_dt=page.locator('input[name="endDt"]').first,
+        search_btn=page.locator('button:has-text("조회")').first,
+        result_table=page.locator(_RESULT_TABLE_MARKER).first,
+    )
+
+
+async def shutdown_shared_browser() -> None:
+    """Close the process-wide browser; call once at process shutdown."""
+    state = _shared_state()
+
+    async with state.lock:
+        if state.browser is not None:
+            await state.browser.close()
+            state.browser = None
+        if state.playwright is not None:
+            await state.playwright.stop()
+            state.playwright = None
+    logger.info("Browser closed")
 
 
 class HometaxLoginType(Enum):
@@ -22,7 +123,7 @@ class HometaxLoginType(Enum):
     NAVER = "naver"  # Naver authentication
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HometaxCredentials:
     """Credentials for Hometax authentication."""
 
@@ -33,7 +134,7 @@ class HometaxCredentials:
     user_password: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TaxInvoiceSearchResult:
     """Tax invoice search result."""
 
@@ -60,9 +161,9 @@ class HometaxScraper:
         """Initialize Hometax scraper."""
         self.credentials = credentials
         self.settings = get_settings()
-        self._playwright: Playwright | None = None
-        self._browser: Browser | None = None
+        self._context: BrowserContext | None = None
         self._page: Page | None = None
+        self._loc: SimpleNamespace | None = None  # Locators of self._page
         self._logged_in = False
 
     async def __aenter__(self) -> "HometaxScraper":
@@ -75,25 +176,23 @@ class HometaxScraper:
         await self.close()
 
     async def start(self) -> None:
-        """Start Playwright browser."""
-        logger.info("Starting Playwright browser...")
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(
-            headless=self.settings.playwright_headless,
-            slow_mo=self.settings.playwright_slow_mo,
+        """Open an isolated context and page on the shared browser."""
+        browser = await _get_shared_browser()
+        self._context = await browser.new_context(
+            viewport={"width": 1920, "height": 1080},
         )
-        self._page = await self._browser.new_page()
-        await self._page.set_viewport_size({"width": 1920, "height": 1080})
-        logger.info("Browser started successfully")
+        await self._context.route(HOMETAX_URL_PATTERN, block_unneeded_resources)
+        self._page = await self._context.new_page()
+        self._loc = _build_locators(self._page)
 
     async def close(self) -> None:
-        """Close browser and cleanup."""
-        if self._browser:
-            await self._browser.close()
-        if self._playwright:
-            await self._playwright.stop()
+        """Close this scraper's context; the shared browser keeps running."""
+        if self._context:
+            await self._context.close()
+        self._context = None
+        self._page = None
+        self._loc = None
         self._logged_in = False
-        logger.info("Browser closed")
 
     @property
     def page(self) -> Page:
@@ -102,6 +201,13 @@ class HometaxScraper:
             raise RuntimeError("Browser not started. Call start() first.")
         return self._page
 
+    @property
+    def loc(self) -> SimpleNamespace:
+        """Get locators of the current page."""
+        if not self._loc:
+            raise RuntimeError("Browser not started. Call start() first.")
+        return self._loc
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
@@ -111,8 +217,14 @@ class HometaxScraper:
         logger.info(f"Logging into Hometax with {self.credentials.login_type.value}...")
 
         try:
-            await self.page.goto(self.LOGIN_URL, timeout=self.settings.hometax_login_timeout)
-            await self.page.wait_for_load_state("networkidle")
+            # Hometax long-polls and sends beacons, so networkidle rarely settles;
+            # wait for the DOM and then for the element the next step needs
+            await self.page.goto(
+                self.LOGIN_URL,
+                wait_until="domcontentloaded",
+                timeout=self.settings.hometax_timeout * 1000,
+            )
+            await self.loc.login_menu.wait_for(state="visible", timeout=_MARKER_TIMEOUT)
 
             if self.credentials.login_type == HometaxLoginType.CERTIFICATE:
                 return await self._login_with_certificate()
@@ -132,8 +244,7 @@ class HometaxScraper:
         logger.info("Attempting certificate login...")
 
         # Click certificate login button
-        await self.page.click('a:has-text("공동인증서")')
-        await asyncio.sleep(2)
+        await self.loc.cert_tab.click()
 
         # Certificate selection dialog handling would go here
         # This is a stub - actual implementation depends on certificate type
@@ -150,18 +261,18 @@ class HometaxScraper:
         logger.info("Attempting simple login...")
 
         # Click simple login tab
-        await self.page.click('a:has-text("아이디 로그인")')
-        await asyncio.sleep(1)
+        await self.loc.id_tab.click()
+        await self.loc.user_id.wait_for(state="visible", timeout=_MARKER_TIMEOUT)
 
         # Fill credentials
-        await self.page.fill('input[name="userId"]', self.credentials.user_id)
-        await self.page.fill('input[name="userPwd"]', self.credentials.user_password)
+        await self.loc.user_id.fill(self.credentials.user_id)
+        await self.loc.user_pwd.fill(self.credentials.user_password)
 
         # Click login button
-        await self.page.click('button:has-text("로그인")')
-        await self.page.wait_for_load_state("networkidle")
+        await self.loc.login_btn.click()
+        await self.page.wait_for_load_state("domcontentloaded")
 
-        # Check if login was successful
+        # Check if login was successful (waits for the logout link)
         if await self._check_login_success():
             self._logged_in = True
             logger.info("Login successful")
@@ -174,7 +285,7 @@ class HometaxScraper:
         """Check if login was successful."""
         try:
             # Look for logout button or user name indicator
-            await self.page.wait_for_selector('a:has-text("로그아웃")', timeout=5000)
+            await self.loc.logout.wait_for(timeout=_MARKER_TIMEOUT)
             return True
         except Exception:
             return False
@@ -191,31 +302,74 @@ class HometaxScraper:
 
         logger.info(f"Searching tax invoices from {start_date} to {end_date}")
 
+        results = await self._do_search(self.page, direction, start_date, end_date)
+        logger.info(f"Found {len(results)} tax invoices")
+
+        return results
+
+    async def search_both(
+        self, start_date: date, end_date: date
+    ) -> tuple[list[TaxInvoiceSearchResult], list[TaxInvoiceSearchResult]]:
+        """Search sales and purchase invoices concurrently in two tabs.
+
+        Returns:
+            (sales, purchase) search results
+        """
+        if not self._logged_in or self._context is None:
+            raise RuntimeError("Not logged in. Call login() first.")
+
+        logger.info(f"Searching sales and purchase invoices from {start_date} to {end_date}")
+
+        # Tabs of one context share the login cookies
+        sales_page, purchase_page = await asyncio.gather(
+            self._context.new_page(), self._context.new_page()
+        )
+        try:
+            sales, purchase = await asyncio.gather(
+                self._do_search(sales_page, "sales", start_date, end_date),
+                self._do_search(purchase_page, "purchase", start_date, end_date),
+            )
+        finally:
+            await asyncio.gather(sales_page.close(), purchase_page.close())
+
+        logger.info(f"Found {len(sales)} sales and {len(purchase)} purchase tax invoices")
+        return sales, purchase
+
+    async def _do_search(
+        self, page: Page, direction: str, start_date: date, end_date: date
+    ) -> list[TaxInvoiceSearchResult]:
+        """Run one search on the given page and parse its results."""
+        loc = self.loc if page is self._page else _build_locators(page)
+
         # Navigate to e-invoice page
-        await self.page.goto(self.EINVOICE_URL, timeout=self.settings.playwright_timeout)
-        await self.page.wait_for_load_state("networkidle")
+        await page.goto(
+            self.EINVOICE_URL,
+            wait_until="domcontentloaded",
+            timeout=self.settings.browser_timeout,
+        )
+        await loc.start_dt.wait_for(state="visible", timeout=_MARKER_TIMEOUT)
 
         # Select direction (sales/purchase)
         if direction == "sales":
-            await self.page.click('input[value="01"]')  # Sales
+            await loc.sales_radio.click()
         else:
-            await self.page.click('input[value="02"]')  # Purchase
+            await loc.purchase_radio.click()
 
         # Fill date range
-        await self.page.fill('input[name="startDt"]', start_date.strftime("%Y%m%d"))
-        await self.page.fill('input[name="endDt"]', end_date.strftime("%Y%m%d"))
+        await loc.start_dt.fill(start_date.strftime("%Y%m%d"))
+        await loc.end_dt.fill(end_date.strftime("%Y%m%d"))
 
         # Click search
-        await self.page.click('button:has-text("조회")')
-        await self.page.wait_for_load_state("networkidle")
+        await loc.search_btn.click()
+        try:
+            await loc.result_table.wait_for(state="visible", timeout=_MARKER_TIMEOUT)
+        except PlaywrightTimeout:
+            logger.warning("Result table did not appear")
 
         # Parse results
-        results = await self._parse_search_results()
-        logger.info(f"Found {len(results)} tax invoices")
+        return await self._parse_search_results(page)
 
-        return results
-
-    async def _parse_search_results(self) -> list[TaxInvoiceSearchResult]:
+    async def _parse_search_results(self, page: Page) -> list[TaxInvoiceSearchResult]:
         """Parse search results from the page."""
         results: list[TaxInvoiceSearchResult] = []
 
@@ -223,24 +377,24 @@ class HometaxScraper:
         # The structure depends on Hometax's current page layout
 
         try:
-            rows = await self.page.query_selector_all("table.result tbody tr")
+            # One round-trip returns every row's cell texts
+            rows: list[list[str]] = await page.evaluate(
+                _TABLE_TEXT_JS, "table.result tbody tr"
+            )
 
-            for row in rows:
-                cells = await row.query_selector_all("td")
+            for cells in rows:
                 if len(cells) >= 9:
                     results.append(
                         TaxInvoiceSearchResult(
-                            nts_confirm_number=await self._get_text(cells[0]),
-                            issue_date=datetime.strptime(
-                                await self._get_text(cells[1]), "%Y-%m-%d"
-                            ).date(),
-                            supplier_business_number=await self._get_text(cells[2]),
-                            supplier_name=await self._get_text(cells[3]),
-                            buyer_business_number=await self._get_text(cells[4]),
-                            buyer_name=await self._get_text(cells[5]),
-                            supply_amount=self._parse_amount(await self._get_text(cells[6])),
-                            tax_amount=self._parse_amount(await self._get_text(cells[7])),
-                            total_amount=self._parse_amount(await self._get_text(cells[8])),
+                            nts_confirm_number=cells[0],
+                            issue_date=date.fromisoformat(cells[1]),
+                            supplier_business_number=cells[2],
+                            supplier_name=cells[3],
+                            buyer_business_number=cells[4],
+                            buyer_name=cells[5],
+                            supply_amount=self._parse_amount(cells[6]),
+                            tax_amount=self._parse_amount(cells[7]),
+                            total_amount=self._parse_amount(cells[8]),
                             status="issued",
                         )
                     )
@@ -249,10 +403,6 @@ class HometaxScraper:
 
         return results
 
-    async def _get_text(self, element: Any) -> str:
-        """Get text content from element."""
-        return (await element.text_content() or "").strip()
-
     def _parse_amount(self, text: str) -> float:
         """Parse amount string to float."""
         try:
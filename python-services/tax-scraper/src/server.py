@@ -8,7 +8,6 @@ to the TaxInvoiceService for business logic.
 import asyncio
 import signal
 import time
-from concurrent import futures
 from typing import Any, AsyncIterator, Optional
 
 import grpc
@@ -17,6 +16,7 @@ from grpc_health.v1 import health, health_pb2, health_pb2_grpc
 from grpc_reflection.v1alpha import reflection
 
 from config import get_settings
+from src.services.notifications import DISCONNECTED, NotificationHub
 from src.services.tax_service import TaxInvoiceService
 
 # Import generated proto code (will be available after proto generation)
@@ -28,17 +28,87 @@ except ImportError:
     tax_pb2_grpc = None
     PROTO_AVAILABLE = False
 
+# Service names resolved once from the descriptors
+TAX_SERVICE_NAME = (
+    tax_pb2.DESCRIPTOR.services_by_name["TaxInvoiceService"].full_name if PROTO_AVAILABLE else None
+)
+REFLECTION_SERVICE_NAMES = tuple(
+    name
+    for name in (
+        reflection.SERVICE_NAME,
+        health_pb2.DESCRIPTOR.services_by_name["Health"].full_name,
+        TAX_SERVICE_NAME,
+    )
+    if name
+)
+
+# Proto enum <-> string mappings, built once; empty when proto code is missing
+if PROTO_AVAILABLE:
+    _AUTH_TYPE_FROM_PROTO = {
+        tax_pb2.AUTH_TYPE_CERTIFICATE: "certificate",
+        tax_pb2.AUTH_TYPE_SIMPLE_AUTH: "simple_auth",
+        tax_pb2.AUTH_TYPE_ID_PASSWORD: "id_password",
+    }
+    _INVOICE_TYPE_FROM_PROTO = {
+        tax_pb2.INVOICE_TYPE_SALES: "sales",
+        tax_pb2.INVOICE_TYPE_PURCHASE: "purchase",
+    }
+    _INVOICE_TYPE_TO_PROTO = {v: k for k, v in _INVOICE_TYPE_FROM_PROTO.items()}
+    _STATUS_TO_PROTO = {
+        "draft": tax_pb2.INVOICE_STATUS_DRAFT,
+        "issued": tax_pb2.INVOICE_STATUS_ISSUED,
+        "transmitted": tax_pb2.INVOICE_STATUS_TRANSMITTED,
+        "confirmed": tax_pb2.INVOICE_STATUS_CONFIRMED,
+        "cancelled": tax_pb2.INVOICE_STATUS_CANCELLED,
+        "rejected": tax_pb2.INVOICE_STATUS_REJECTED,
+    }
+    _INVOICE_TYPE_UNSPECIFIED = tax_pb2.INVOICE_TYPE_UNSPECIFIED
+    _STATUS_UNSPECIFIED = tax_pb2.INVOICE_STATUS_UNSPECIFIED
+else:
+    _AUTH_TYPE_FROM_PROTO = {}
+    _INVOICE_TYPE_FROM_PROTO = {}
+    _INVOICE_TYPE_TO_PROTO = {}
+    _STATUS_TO_PROTO = {}
+    _INVOICE_TYPE_UNSPECIFIED = 0
+    _STATUS_UNSPECIFIED = 0
+
+# Invoices per GetTaxInvoicesStream message unless the request sets page_size
+_STREAM_BATCH_SIZE = 100
+
+# Service error codes caused by the request rather than by the server
+_INVALID_ARGUMENT_ERRORS = frozenset({"INVALID_DATE_RANGE", "INVALID_BATCH_SIZE"})
+
 logger = structlog.get_logger()
 
 
 class TaxInvoiceServicer:
     """gRPC servicer for TaxInvoiceService."""
 
-    def __init__(self) -> None:
-        """Initialize the servicer."""
-        self.service = TaxInvoiceService()
+    def __init__(self, service: Optional[TaxInvoiceService] = None) -> None:
+        """
+        Initialize the servicer.
+
+        Args:
+            service: Service shared with other servicers; created if omitted
+        """
+        settings = get_settings()
+        self.service = service or TaxInvoiceService()
+        self.notifications = NotificationHub(settings.redis_url)
         self.log = logger.bind(component="TaxInvoiceServicer")
         self._start_time = time.time()
+        # Everything but uptime is fixed; HealthCheck copies this per probe
+        self._health_template = (
+            tax_pb2.HealthCheckResponse(
+                healthy=True,
+                version=settings.service_version,
+                services={
+                    "hometax_scraper": True,
+                    "popbill_client": True,
+                },
+            )
+            if PROTO_AVAILABLE
+            else None
+        )
 
     async def Login(
         self,
@@ -121,7 +191,11 @@ class TaxInvoiceServicer:
         )
 
         if not result["success"]:
-            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_code(
+                grpc.StatusCode.INVALID_ARGUMENT
+                if result.get("error_code") in _INVALID_ARGUMENT_ERRORS
+                else grpc.StatusCode.INTERNAL
+            )
             context.set_details(result.get("error_message", "Query failed"))
 
         # Convert invoices to proto messages
@@ -139,6 +213,52 @@ class TaxInvoiceServicer:
             error_message=result.get("error_message", ""),
         )
 
+    async def GetTaxInvoicesStream(
+        self,
+        request: Any,
+        context: grpc.aio.ServicerContext,
+    ) -> AsyncIterator[Any]:
+        """Handle GetTaxInvoicesStream RPC (server streaming)."""
+        self.log.info(
+            "rpc_get_tax_invoices_stream",
+            session_id=request.session_id[:8] + "..." if request.session_id else "",
+            start_date=request.start_date,
+            end_date=request.end_date,
+        )
+
+        if request.page_size < 0:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("page_size must not be negative")
+            return
+
+        invoice_type = None
+        if request.HasField("invoice_type"):
+            invoice_type = self._map_invoice_type(request.invoice_type)
+
+        async for result in self.service.iter_tax_invoices(
+            session_id=request.session_id,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            invoice_type=invoice_type,
+            batch_size=request.page_size or _STREAM_BATCH_SIZE,
+        ):
+            if not result["success"]:
+                context.set_code(
+                    grpc.StatusCode.INVALID_ARGUMENT
+                    if result.get("error_code") in _INVALID_ARGUMENT_ERRORS
+                    else grpc.StatusCode.INTERNAL
+                )
+                context.set_details(result.get("error_message", "Query failed"))
+
+            yield tax_pb2.GetTaxInvoicesResponse(
+                success=result["success"],
+                invoices=[self._dict_to_proto_invoice(inv) for inv in result.get("invoices", [])],
+                total_count=result.get("total_count", 0),
+                page=result.get("page", 1),
+                page_size=result.get("page_size", 0),
+                error_message=result.get("error_message", ""),
+            )
+
     async def IssueTaxInvoice(
         self,
         request: Any,
@@ -280,12 +400,44 @@ class TaxInvoiceServicer:
             session_id=request.session_id[:8] + "..." if request.session_id else "",
         )
 
-        # This is a placeholder for streaming notifications
-        # In production, this would connect to a message queue or webhook system
-        while not context.cancelled():
-            await asyncio.sleep(30)  # Poll interval
-            # Check for new notifications and yield them
-            # yield tax_pb2.InvoiceNotification(...)
+        company_id = self.service.get_session_company(request.session_id)
+        if company_id is None:
+            context.set_code(grpc.StatusCode.UNAUTHENTICATED)
+            context.set_details("Invalid session")
+            return
+
+        if not self.notifications.running:
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details("Notifications unavailable")
+            return
+
+        invoice_types = set(request.invoice_types)
+        queue = self.notifications.subscribe(company_id)
+        try:
+            # Woken only when the shared Redis subscriber delivers a notification;
+            # cancellation by the client raises out of queue.get()
+            while True:
+                notification = await queue.get()
+                if notification is DISCONNECTED:
+                    # Clients reconnect; notifications sent meanwhile are lost
+                    context.set_code(grpc.StatusCode.UNAVAILABLE)
+                    context.set_details("Notification subscription lost")
+                    return
+                invoice_type = self._map_invoice_type_to_proto(
+                    notification.get("invoice_type", "")
+                )
+                if invoice_types and invoice_type not in invoice_types:
+                    continue
+                yield tax_pb2.InvoiceNotification(
+                    notification_id=notification.get("notification_id", ""),
+                    invoice_number=notification.get("invoice_number", ""),
+                    invoice_type=invoice_type,
+                    status=self._map_status_to_proto(notification.get("status", "")),
+                    message=notification.get("message", ""),
+                    timestamp=notification.get("timestamp", ""),
+                )
+        finally:
+            self.notifications.unsubscribe(company_id, queue)
 
     async def HealthCheck(
         self,
@@ -294,55 +446,26 @@ class TaxInvoiceServicer:
     ) -> Any:
         """Handle HealthCheck RPC."""
         uptime = time.time() - self._start_time
-        settings = get_settings()
 
-        return tax_pb2.HealthCheckResponse(
-            healthy=True,
-            version=settings.service_version,
-            uptime=f"{uptime:.2f}s",
-            services={
-                "hometax_scraper": True,
-                "popbill_client": True,
-            },
-        )
+        response = tax_pb2.HealthCheckResponse()
+        response.CopyFrom(self._health_template)
+        response.uptime = f"{uptime:.2f}s"
+        return response
 
-    def _map_auth_type(self, proto_auth_type: int) -> str:
+    @staticmethod
+    def _map_auth_type(proto_auth_type: int) -> str:
         """Map proto AuthType to string."""
-        if not tax_pb2:
-            return "certificate"
-
-        mapping = {
-            tax_pb2.AUTH_TYPE_CERTIFICATE: "certificate",
-            tax_pb2.AUTH_TYPE_SIMPLE_AUTH: "simple_auth",
-            tax_pb2.AUTH_TYPE_ID_PASSWORD: "id_password",
-        }
-        return mapping.get(proto_auth_type, "certificate")
+        return _AUTH_TYPE_FROM_PROTO.get(proto_auth_type, "certificate")
 
-    def _map_invoice_type(self, proto_invoice_type: int) -> str:
+    @staticmethod
+    def _map_invoice_type(proto_invoice_type: int) -> str:
         """Map proto InvoiceType to string."""
-        if not tax_pb2:
-            return "sales"
-
-        mapping = {
-            tax_pb2.INVOICE_TYPE_SALES: "sales",
-            tax_pb2.INVOICE_TYPE_PURCHASE: "purchase",
-        }
-        return mapping.get(proto_invoice_type, "sales")
+        return _INVOICE_TYPE_FROM_PROTO.get(proto_invoice_type, "sales")
 
-    def _map_status_to_proto(self, status: str) -> int:
+    @staticmethod
+    def _map_status_to_proto(status: str) -> int:
         """Map status string to proto InvoiceStatus."""
-        if not tax_pb2:
-            return 0
-
-        mapping = {
-            "draft": tax_pb2.INVOICE_STATUS_DRAFT,
-            "issued": tax_pb2.INVOICE_STATUS_ISSUED,
-            "transmitted": tax_pb2.INVOICE_STATUS_TRANSMITTED,
-            "confirmed": tax_pb2.INVOICE_STATUS_CONFIRMED,
-            "cancelled": tax_pb2.INVOICE_STATUS_CANCELLED,
-            "rejected": tax_pb2.INVOICE_STATUS_REJECTED,
-        }
-        return mapping.get(status, tax_pb2.INVOICE_STATUS_UNSPECIFIED)
+        return _STATUS_TO_PROTO.get(status, _STATUS_UNSPECIFIED)
 
     def _dict_to_proto_invoice(self, invoice_dict: dict) -> Any:
         """Convert invoice dictionary to proto message."""
@@ -369,16 +492,10 @@ class TaxInvoiceServicer:
             remarks=invoice_dict.get("remarks", ""),
         )
 
-    def _map_invoice_type_to_proto(self, invoice_type: str) -> int:
+    @staticmethod
+    def _map_invoice_type_to_proto(invoice_type: str) -> int:
         """Map invoice type string to proto enum."""
-        if not tax_pb2:
-            return 0
-
-        mapping = {
-            "sales": tax_pb2.INVOICE_TYPE_SALES,
-            "purchase": tax_pb2.INVOICE_TYPE_PURCHASE,
-        }
-        return mapping.get(invoice_type, tax_pb2.INVOICE_TYPE_UNSPECIFIED)
+        return _INVOICE_TYPE_TO_PROTO.get(invoice_type, _INVOICE_TYPE_UNSPECIFIED)
 
     def _proto_invoice_to_dict(self, proto_invoice: Any) -> dict:
         """Convert proto invoice to dictionary."""
@@ -413,17 +530,29 @@ class TaxInvoiceServicer:
             ],
         }
 
+    async def start(self) -> None:
+        """Prepare service resources before serving requests."""
+        # Subscribes in the background; streams get UNAVAILABLE until it is up
+        await self.notifications.start()
+        await self.service.start()
+
     async def close(self) -> None:
         """Close the servicer and release resources."""
+        await self.notifications.close()
         await self.service.close()
 
 
 class PopbillServicer:
     """gRPC servicer for PopbillService."""
 
-    def __init__(self) -> None:
-        """Initialize the servicer."""
-        self.service = TaxInvoiceService()
+    def __init__(self, service: Optional[TaxInvoiceService] = None) -> None:
+        """
+        Initialize the servicer.
+
+        Args:
+            service: Service shared with other servicers; created if omitted
+        """
+        self.service = service or TaxInvoiceService()
         self.log = logger.bind(component="PopbillServicer")
 
     # Implement Popbill-specific RPCs here
@@ -440,8 +569,9 @@ async def serve() -> None:
     )
 
     # Create gRPC server
+    # Handlers are coroutines on this loop, so no thread pool is needed;
+    # HometaxScraper bounds concurrent browser work itself
     server = grpc.aio.server(
-        futures.ThreadPoolExecutor(max_workers=settings.grpc_max_workers),
         options=[
             ("grpc.max_send_message_length", 50 * 1024 * 1024),
             ("grpc.max_receive_message_length", 50 * 1024 * 1024),
@@ -450,8 +580,15 @@ async def serve() -> None:
         ],
     )
 
-    # Create servicer
-    tax_servicer = TaxInvoiceServicer()
+    # One service per process, so all servicers share its browser and
+    # Popbill connection pools
+    service = TaxInvoiceService()
+    tax_servicer = TaxInvoiceServicer(service)
+    try:
+        await tax_servicer.start()
+    except Exception as e:
+        # Contexts are still created on demand if pre-warming fails
+        log.warning("browser_prewarm_failed", error=str(e))
 
     # Register services
     if PROTO_AVAILABLE:
@@ -459,7 +596,7 @@ async def serve() -> None:
         log.info("tax_invoice_service_registered")
 
         # Optionally register PopbillService
-        # popbill_servicer = PopbillServicer()
+        # popbill_servicer = PopbillServicer(service)
         # tax_pb2_grpc.add_PopbillServiceServicer_to_server(popbill_servicer, server)
     else:
         log.warning("proto_not_available", message="Run scripts/generate_grpc.sh first")
@@ -470,24 +607,13 @@ async def serve() -> None:
     health_servicer.set("", health_pb2.HealthCheckResponse.SERVING)
 
     if PROTO_AVAILABLE:
-        health_servicer.set(
-            tax_pb2.DESCRIPTOR.services_by_name["TaxInvoiceService"].full_name,
-            health_pb2.HealthCheckResponse.SERVING,
-        )
+        health_servicer.set(TAX_SERVICE_NAME, health_pb2.HealthCheckResponse.SERVING)
 
     log.info("health_service_registered")
 
     # Enable reflection for development
     if settings.grpc_reflection_enabled:
-        service_names = [
-            reflection.SERVICE_NAME,
-            health_pb2.DESCRIPTOR.services_by_name["Health"].full_name,
-        ]
-        if PROTO_AVAILABLE:
-            service_names.append(
-                tax_pb2.DESCRIPTOR.services_by_name["TaxInvoiceService"].full_name
-            )
-        reflection.enable_server_reflection(service_names, server)
+        reflection.enable_server_reflection(REFLECTION_SERVICE_NAMES, server)
         log.info("grpc_reflection_enabled")
 
     # Start server
@@ -521,4 +647,9 @@ async def serve() -> None:
     log.info("initiating_graceful_shutdown")
     await tax_servicer.close()
     await server.stop(grace=5)
+
+    # The legacy scraper shares one browser per process; a no-op if never started
+    from src.scrapers.hometax import shutdown_shared_browser
+
+    await shutdown_shared_browser()
     log.info("grpc_server_stopped")
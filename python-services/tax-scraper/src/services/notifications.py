@@ -0,0 +1,178 @@
+"""
+Invoice Notification Fan-out
+
+A single Redis pub/sub subscription per process feeds every notification
+stream; each stream reads from its own bounded asyncio queue. A lost
+subscription ends the open streams and is re-established with backoff.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Any, Optional
+
+import orjson
+import structlog
+from redis import asyncio as aioredis
+
+logger = structlog.get_logger()
+
+# Notifications for a company are published on CHANNEL_PREFIX + company_id
+CHANNEL_PREFIX = "tax:notifications:"
+
+# Resubscribe backoff after the Redis connection is lost, in seconds
+_RECONNECT_DELAY = 1.0
+_RECONNECT_MAX_DELAY = 30.0
+
+# Queued after a lost subscription; the stream ends on reading it
+DISCONNECTED: Any = object()
+
+
+class NotificationHub:
+    """
+    Fans out invoice notifications from Redis to subscribed streams.
+
+    Producers publish JSON objects with the InvoiceNotification fields to
+    ``tax:notifications:{company_id}``. Slow subscribers lose their oldest
+    queued notifications rather than blocking the dispatcher.
+    """
+
+    def __init__(self, redis_url: str, queue_size: int = 100) -> None:
+        """
+        Initialize the hub.
+
+        Args:
+            redis_url: Redis connection URL
+            queue_size: Notifications buffered per subscriber
+        """
+        self._redis_url = redis_url
+        self._queue_size = queue_size
+        self._redis: Optional[aioredis.Redis] = None
+        self._task: Optional[asyncio.Task] = None
+        self._subscribed = False
+        self._queues: defaultdict[str, set[asyncio.Queue]] = defaultdict(set)
+        self.log = logger.bind(component="NotificationHub")
+
+    @property
+    def running(self) -> bool:
+        """Whether the Redis subscription is currently established."""
+        return self._subscribed
+
+    async def start(self) -> None:
+        """Start dispatching; the subscription is established in the background."""
+        if self._redis is None:
+            self._redis = aioredis.from_url(self._redis_url)
+        self._task = asyncio.create_task(self._dispatch())
+        self.log.info("notification_hub_started")
+
+    def subscribe(self, company_id: str) -> asyncio.Queue:
+        """
+        Register a stream for a company's notifications.
+
+        Args:
+            company_id: Company whose notifications to receive
+
+        Returns:
+            Queue receiving notification payloads, then DISCONNECTED if the
+            subscription is lost
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._queues[company_id].add(queue)
+        return queue
+
+    def unsubscribe(self, company_id: str, queue: asyncio.Queue) -> None:
+        """Remove a queue returned by subscribe()."""
+        queues = self._queues.get(company_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[company_id]
+
+    async def publish(self, company_id: str, notification: dict[str, Any]) -> None:
+        """
+        Publish a notification to all streams of a company, on every instance.
+
+        Args:
+            company_id: Company the notification belongs to
+            notification: InvoiceNotification fields
+        """
+        if self._redis is None:
+            self._redis = aioredis.from_url(self._redis_url)
+        await self._redis.publish(f"{CHANNEL_PREFIX}{company_id}", orjson.dumps(notification))
+
+    def _deliver(self, channel: str, data: bytes) -> None:
+        """Put one published message on the queues of its company."""
+        queues = self._queues.get(channel[len(CHANNEL_PREFIX):])
+        if not queues:
+            return
+
+        try:
+            notification = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            notification = None
+        if not isinstance(notification, dict):
+            self.log.warning("notification_invalid", channel=channel)
+            return
+
+        for queue in queues:
+            self._put(queue, notification)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, item: Any) -> None:
+        """Queue an item, dropping the oldest one when the queue is full."""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+    def _disconnect_subscribers(self) -> None:
+        """End every open stream; notifications sent meanwhile are lost."""
+        for queues in self._queues.values():
+            for queue in queues:
+                self._put(queue, DISCONNECTED)
+        self._queues.clear()
+
+    async def _dispatch(self) -> None:
+        """Keep the subscription open, resubscribing with backoff, and deliver messages."""
+        delay = _RECONNECT_DELAY
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                self._subscribed = True
+                delay = _RECONNECT_DELAY
+                self.log.info("notification_subscribed")
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    self._deliver(channel, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.log.error("notification_dispatch_failed", error=str(e), retry_in=delay)
+            finally:
+                if self._subscribed:
+                    self._subscribed = False
+                    self._disconnect_subscribers()
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RECONNECT_MAX_DELAY)
+
+    async def close(self) -> None:
+        """Stop dispatching and close the Redis connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        self._queues.clear()
@@ -7,12 +7,17 @@ Hometax scraper and Popbill API provider.
 
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import structlog
 
 from config import get_settings
-from providers.popbill import PopbillClient, PopbillConfig, PopbillTaxInvoice
+from providers.popbill import (
+    PopbillClient,
+    PopbillConfig,
+    PopbillInvoiceStatus,
+    PopbillTaxInvoice,
+)
 from src.hometax.models import (
     AuthType,
     HometaxSession,
@@ -28,6 +33,16 @@ from src.utils.validators import (
 
 logger = structlog.get_logger()
 
+# Popbill status mapped to the service's status names
+_POPBILL_STATUS_NAMES = {
+    PopbillInvoiceStatus.DRAFT: "draft",
+    PopbillInvoiceStatus.SUBMITTED: "issued",
+    PopbillInvoiceStatus.SENT_TO_NTS: "transmitted",
+    PopbillInvoiceStatus.NTS_CONFIRMED: "confirmed",
+    PopbillInvoiceStatus.NTS_REJECTED: "rejected",
+    PopbillInvoiceStatus.CANCELLED: "cancelled",
+}
+
 
 class TaxInvoiceService:
     """
@@ -44,7 +59,9 @@ class TaxInvoiceService:
         self.log = logger.bind(component="TaxInvoiceService")
         self._scraper: Optional[HometaxScraper] = None
         self._popbill: Optional[PopbillClient] = None
+        # Sessions and their owning companies, keyed by session ID
         self._sessions: dict[str, HometaxSession] = {}
+        self._session_companies: dict[str, str] = {}
 
     async def _get_scraper(self) -> HometaxScraper:
         """Get or create Hometax scraper instance."""
@@ -52,6 +69,24 @@ class TaxInvoiceService:
             self._scraper = HometaxScraper()
         return self._scraper
 
+    async def start(self) -> None:
+        """Pre-warm the Hometax browser so the first login skips cold start."""
+        scraper = await self._get_scraper()
+        await scraper.start()
+        self.log.info("service_started")
+
+    def get_session_company(self, session_id: str) -> Optional[str]:
+        """
+        Get the company that owns a session.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Company ID, or None if the session is unknown
+        """
+        return self._session_companies.get(session_id)
+
     async def _get_popbill(self) -> PopbillClient:
         """Get or create Popbill client instance."""
         if self._popbill is None:
@@ -115,8 +150,8 @@ class TaxInvoiceService:
             )
 
             # Store session with company context
-            session_key = f"{company_id}:{session.session_id}"
-            self._sessions[session_key] = session
+            self._sessions[session.session_id] = session
+            self._session_companies[session.session_id] = company_id
 
             self.log.info(
                 "login_success",
@@ -156,10 +191,8 @@ class TaxInvoiceService:
             await scraper.logout(session_id)
 
             # Remove session from cache
-            for key in list(self._sessions.keys()):
-                if key.endswith(f":{session_id}"):
-                    del self._sessions[key]
-                    break
+            self._sessions.pop(session_id, None)
+            self._session_companies.pop(session_id, None)
 
             self.log.info("logout_success")
             return {"success": True}
@@ -193,6 +226,81 @@ class TaxInvoiceService:
         Returns:
             Search results with invoices
         """
+        error, invoices = await self._search_tax_invoices(
+            session_id, start_date, end_date, invoice_type
+        )
+        if error is not None:
+            return error
+
+        # Apply pagination
+        result = self._invoice_page(invoices, page, page_size)
+        self.log.info(
+            "get_invoices_success",
+            total_count=result["total_count"],
+            returned_count=len(result["invoices"]),
+        )
+        return result
+
+    async def iter_tax_invoices(
+        self,
+        session_id: str,
+        start_date: str,
+        end_date: str,
+        invoice_type: Optional[str] = None,
+        batch_size: int = 100,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """
+        Get tax invoices from Hometax in batches.
+
+        The search is scraped once and each batch is one page of its
+        result, in the same shape get_tax_invoices() returns.
+
+        Args:
+            session_id: Active session ID
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            invoice_type: Filter by invoice type
+            batch_size: Invoices per batch
+
+        Yields:
+            Search results holding one batch of invoices each; a failed
+            search yields a single result with the error
+        """
+        if batch_size < 1:
+            yield {
+                "success": False,
+                "error_message": "Batch size must be positive",
+                "error_code": "INVALID_BATCH_SIZE",
+            }
+            return
+
+        error, invoices = await self._search_tax_invoices(
+            session_id, start_date, end_date, invoice_type
+        )
+        if error is not None:
+            yield error
+            return
+
+        page = 1
+        while True:
+            yield self._invoice_page(invoices, page, batch_size)
+            # An empty search still yields one batch carrying total_count
+            if page * batch_size >= len(invoices):
+                return
+            page += 1
+
+    async def _search_tax_invoices(
+        self,
+        session_id: str,
+        start_date: str,
+        end_date: str,
+        invoice_type: Optional[str],
+    ) -> tuple[Optional[dict[str, Any]], list[TaxInvoice]]:
+        """Validate the date range and run one invoice search.
+
+        Returns:
+            (error result, []) if the search failed, else (None, invoices)
+        """
         self.log.info(
             "get_invoices_request",
             session_id=session_id[:8] + "...",
@@ -207,7 +315,8 @@ class TaxInvoiceService:
             return {
                 "success": False,
                 "error_message": error_msg,
-            }
+                "error_code": "INVALID_DATE_RANGE",
+            }, []
 
         try:
             scraper = await self._get_scraper()
@@ -217,33 +326,29 @@ class TaxInvoiceService:
                 end_date=end_date,
                 invoice_type=invoice_type,
             )
-
-            # Apply pagination
-            total_count = len(invoices)
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            paginated = invoices[start_idx:end_idx]
-
-            self.log.info(
-                "get_invoices_success",
-                total_count=total_count,
-                returned_count=len(paginated),
-            )
-
-            return {
-                "success": True,
-                "invoices": [self._invoice_to_dict(inv) for inv in paginated],
-                "total_count": total_count,
-                "page": page,
-                "page_size": page_size,
-            }
+            return None, invoices
 
         except Exception as e:
             self.log.error("get_invoices_failed", error=str(e))
             return {
                 "success": False,
                 "error_message": str(e),
-            }
+            }, []
+
+    def _invoice_page(
+        self, invoices: list[TaxInvoice], page: int, page_size: int
+    ) -> dict[str, Any]:
+        """Build the search result holding one page of invoices."""
+        start_idx = (page - 1) * page_size
+        end_idx = start_idx + page_size
+
+        return {
+            "success": True,
+            "invoices": [self._invoice_to_dict(inv) for inv in invoices[start_idx:end_idx]],
+            "total_count": len(invoices),
+            "page": page,
+            "page_size": page_size,
+        }
 
     async def issue_tax_invoice(
         self,
@@ -390,11 +495,7 @@ class TaxInvoiceService:
             popbill = await self._get_popbill()
 
             # Get company info from session
-            session = None
-            for key, sess in self._sessions.items():
-                if key.endswith(f":{session_id}"):
-                    session = sess
-                    break
+            session = self._sessions.get(session_id)
 
             if not session:
                 return {
@@ -448,11 +549,7 @@ class TaxInvoiceService:
             popbill = await self._get_popbill()
 
             # Get session info
-            session = None
-            for key, sess in self._sessions.items():
-                if key.endswith(f":{session_id}"):
-                    session = sess
-                    break
+            session = self._sessions.get(session_id)
 
             if not session:
                 return {
@@ -465,10 +562,12 @@ class TaxInvoiceService:
                 invoice_number=invoice_number,
             )
 
+            state = PopbillInvoiceStatus.from_code(str(invoice_data.get("stateCode", "")))
+
             return {
                 "success": True,
                 "invoice_number": invoice_number,
-                "status": invoice_data.get("stateCode", ""),
+                "status": _POPBILL_STATUS_NAMES.get(state, ""),
                 "nts_confirm_number": invoice_data.get("ntsconfirmNum", ""),
                 "last_updated": invoice_data.get("modifyDT", ""),
             }
@@ -572,4 +671,5 @@ class TaxInvoiceService:
         if self._popbill:
             await self._popbill.close()
         self._sessions.clear()
+        self._session_companies.clear()
         self.log.info("service_closed")
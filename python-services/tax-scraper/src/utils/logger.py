@@ -7,6 +7,7 @@ Uses structlog for structured JSON logging.
 import logging
 import sys
 
+import orjson
 import structlog
 
 
@@ -38,11 +39,13 @@ def setup_logger(
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("playwright").setLevel(logging.WARNING)
 
-    # Choose renderer based on format
+    # Choose renderer based on format; orjson renders bytes, written as-is
     if log_format == "json":
-        renderer = structlog.processors.JSONRenderer()
+        renderer = structlog.processors.JSONRenderer(serializer=orjson.dumps)
+        logger_factory = structlog.BytesLoggerFactory()
     else:
         renderer = structlog.dev.ConsoleRenderer(colors=True)
+        logger_factory = structlog.PrintLoggerFactory()
 
     # Configure structlog
     structlog.configure(
@@ -68,7 +71,7 @@ def setup_logger(
         ],
         wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
@@ -125,6 +125,25 @@ class TestTaxInvoice:
                 total_amount=Decimal("110"),
             )
 
+    def test_invoice_is_frozen(self):
+        """Test that invoices are immutable and ignore unknown fields."""
+        invoice = TaxInvoice(
+            invoice_number="20240115-003",
+            issue_date=datetime(2024, 1, 15),
+            supplier_business_number="1234567890",
+            supplier_name="Supplier",
+            buyer_business_number="0987654321",
+            buyer_name="Buyer",
+            supply_amount=Decimal("100"),
+            tax_amount=Decimal("10"),
+            total_amount=Decimal("110"),
+            unknown_field="ignored",
+        )
+
+        assert not hasattr(invoice, "unknown_field")
+        with pytest.raises(ValueError):
+            invoice.status = InvoiceStatus.ISSUED
+
 
 class TestIssuedInvoiceResult:
     """Tests for IssuedInvoiceResult model."""
@@ -5,8 +5,12 @@ Tests cover:
 - Validators (business number, date range)
 - Popbill client
 - Tax service
+- Hometax page parsing
+- Settings loading
 """
 
+import asyncio
+import time
 import pytest
 from datetime import date, datetime, timedelta
 from decimal import Decimal
@@ -247,6 +251,28 @@ class TestPopbillClient:
         )
         assert "test" not in config.base_url.lower()
 
+    def test_popbill_sign_matches_hmac(self, popbill_client):
+        """Test token signature equals a freshly keyed HMAC-SHA256."""
+        import base64
+        import hashlib
+        import hmac
+
+        expected = base64.b64encode(
+            hmac.new(b"test_secret_key", b"test_link_id\n1700000000\n", hashlib.sha256).digest()
+        ).decode("utf-8")
+
+        assert popbill_client._sign("1700000000") == expected
+        # Template state must not leak between signatures
+        assert popbill_client._sign("1700000000") == expected
+
+    def test_popbill_enum_from_code(self):
+        """Test flat code lookups for Popbill enums."""
+        from providers.popbill import PopbillInvoiceStatus, PopbillInvoiceType
+
+        assert PopbillInvoiceType.from_code("02") is PopbillInvoiceType.PURCHASE
+        assert PopbillInvoiceStatus.from_code("301") is PopbillInvoiceStatus.NTS_CONFIRMED
+        assert PopbillInvoiceStatus.from_code("999") is None
+
     def test_popbill_invoice_to_dict(self):
         """Test PopbillTaxInvoice serialization."""
         from providers.popbill import PopbillTaxInvoice, PopbillInvoiceType
@@ -308,6 +334,318 @@ class TestPopbillClient:
         assert result.ntsa_key == "NTS-KEY-12345"
         assert result.invoice_number == "TEST-001"
 
+    @pytest.mark.asyncio
+    async def test_popbill_client_issue_invoices_batch(self, popbill_client):
+        """Test batch issuance keeps input order and isolates failures."""
+        from providers.popbill import PopbillTaxInvoice
+
+        invoices = [
+            PopbillTaxInvoice(
+                invoice_number=f"TEST-00{i}",
+                write_date="20240115",
+                invoicer_corp_num="1234567890",
+                invoicer_corp_name="Test Company",
+                invoicer_ceo_name="Test CEO",
+                remark1=f"TEST-00{i}",
+            )
+            for i in range(3)
+        ]
+
+        async def fake_request(method, endpoint, corp_num, data=None, user_id=None):
+            if data["remark1"] == "TEST-001":
+                raise RuntimeError("boom")
+            return {"ntsaKey": "KEY"}
+
+        popbill_client._request = AsyncMock(side_effect=fake_request)
+
+        results = await popbill_client.issue_tax_invoices_batch(
+            corp_num="1234567890",
+            invoices=invoices,
+            concurrency=2,
+        )
+
+        assert [r.invoice_number for r in results] == ["TEST-000", "TEST-001", "TEST-002"]
+        assert [r.success for r in results] == [True, False, True]
+        assert results[1].error_message == "boom"
+
+    @pytest.mark.asyncio
+    async def test_popbill_batch_issue_rejects_invalid_concurrency(self, popbill_client):
+        """Test a batch issue with no request slots fails instead of hanging."""
+        popbill_client._request = AsyncMock()
+
+        with pytest.raises(ValueError, match="concurrency"):
+            await popbill_client.issue_tax_invoices_batch(
+                corp_num="1234567890",
+                invoices=[],
+                concurrency=0,
+            )
+
+        popbill_client._request.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_popbill_access_token_shared_across_clients(self, popbill_config):
+        """Test clients with the same LinkID share one token fetch."""
+        from providers import popbill
+
+        token_response = MagicMock(
+            status_code=200,
+            content=b'{"access_token": "TOKEN", "expires_in": 3600}',
+        )
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0)
+            return token_response
+
+        with patch.dict(popbill._TOKEN_CACHE, clear=True):
+            first = popbill.PopbillClient(popbill_config)
+            second = popbill.PopbillClient(popbill_config)
+            first._client.post = AsyncMock(side_effect=slow_post)
+            second._client.post = AsyncMock(side_effect=slow_post)
+
+            # Concurrent first calls from both clients wait on one refresh
+            assert await asyncio.gather(
+                first._get_access_token("1234567890"),
+                second._get_access_token("1234567890"),
+            ) == ["TOKEN", "TOKEN"]
+
+        first._client.post.assert_awaited_once()
+        second._client.post.assert_not_awaited()
+
+    def test_popbill_token_refresh_across_event_loops(self, popbill_config):
+        """Test clients on separate event loops do not share a loop-bound lock."""
+        from providers import popbill
+
+        token_response = MagicMock(
+            status_code=200,
+            content=b'{"access_token": "TOKEN", "expires_in": 3600}',
+        )
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0)
+            return token_response
+
+        async def concurrent_fetches():
+            client = popbill.PopbillClient(popbill_config)
+            client._client.post = AsyncMock(side_effect=slow_post)
+            return await asyncio.gather(
+                client._get_access_token("1234567890"),
+                client._get_access_token("1234567890"),
+            )
+
+        for _ in range(2):
+            with patch.dict(popbill._TOKEN_CACHE, clear=True):
+                assert asyncio.run(concurrent_fetches()) == ["TOKEN", "TOKEN"]
+
+    @pytest.mark.asyncio
+    async def test_popbill_access_token_refreshed_near_expiry(self, popbill_client):
+        """Test a token inside the 5-minute refresh margin is re-fetched."""
+        import time
+
+        from providers import popbill
+
+        token_response = MagicMock(
+            status_code=200,
+            content=b'{"access_token": "NEW", "expires_in": 3600}',
+        )
+        popbill_client._client.post = AsyncMock(return_value=token_response)
+        key = ("test_link_id", True, popbill._TOKEN_SCOPE)
+
+        with patch.dict(popbill._TOKEN_CACHE, {key: ("OLD", time.monotonic() + 60)}, clear=True):
+            assert await popbill_client._get_access_token("1234567890") == "NEW"
+
+    @pytest.mark.asyncio
+    async def test_popbill_request_encodes_post_body(self, popbill_client):
+        """Test POST payloads are sent as pre-encoded JSON bytes."""
+        popbill_client._get_access_token = AsyncMock(return_value="TOKEN")
+        popbill_client._client.post = AsyncMock(
+            return_value=MagicMock(status_code=200, content=b'{"ok": true}')
+        )
+
+        result = await popbill_client._request("POST", "/Taxinvoice/1234567890", "1234567890", {"a": 1})
+        await popbill_client._request("POST", "/Taxinvoice/1234567890/X/Request", "1234567890")
+
+        assert result == {"ok": True}
+        first, second = popbill_client._client.post.await_args_list
+        assert first.kwargs["content"] == b'{"a":1}'
+        assert second.kwargs["content"] is None
+
+    @pytest.mark.asyncio
+    async def test_popbill_query_cache_coalesces_requests(self, popbill_client):
+        """Test concurrent identical queries share one request and are cached."""
+        import asyncio
+
+        async def slow_request(*args, **kwargs):
+            await asyncio.sleep(0)
+            return {"stateCode": 300}
+
+        popbill_client._request = AsyncMock(side_effect=slow_request)
+
+        results = await asyncio.gather(
+            *(popbill_client.query_tax_invoice("1234567890", "INV-1") for _ in range(5))
+        )
+        await popbill_client.query_tax_invoice("1234567890", "INV-1")
+
+        assert all(r == {"stateCode": 300} for r in results)
+        assert popbill_client._request.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_popbill_query_cache_invalidated_on_cancel(self, popbill_client):
+        """Test cancelling an invoice drops its cached query response."""
+        popbill_client._request = AsyncMock(return_value={"stateCode": 300})
+
+        await popbill_client.query_tax_invoice("1234567890", "INV-1")
+        await popbill_client.cancel_tax_invoice("1234567890", "INV-1")
+        await popbill_client.query_tax_invoice("1234567890", "INV-1")
+
+        get_calls = [c for c in popbill_client._request.await_args_list if c.args[0] == "GET"]
+        assert len(get_calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_popbill_query_lock_released_on_failure(self, popbill_client):
+        """Test a failed cached query does not leave its lock behind."""
+        from providers.popbill import PopbillError
+
+        popbill_client._request = AsyncMock(side_effect=PopbillError("-1", "boom"))
+
+        with pytest.raises(PopbillError):
+            await popbill_client.query_tax_invoice("1234567890", "INV-1")
+
+        assert not popbill_client._query_locks
+
+    @pytest.mark.asyncio
+    async def test_popbill_query_lock_kept_for_newer_caller(self, popbill_client):
+        """Test a finishing query does not drop a lock installed after its own."""
+        from providers.popbill import PopbillError
+
+        release = asyncio.Event()
+
+        async def slow_request(method, endpoint, corp_num, params=None, user_id=None):
+            await release.wait()
+            raise PopbillError("-1", "boom")
+
+        popbill_client._request = AsyncMock(side_effect=slow_request)
+        first = asyncio.create_task(popbill_client.query_tax_invoice("1234567890", "INV-1"))
+        await asyncio.sleep(0)
+
+        key = next(iter(popbill_client._query_locks))
+        newer = asyncio.Lock()
+        popbill_client._query_locks[key] = newer
+        release.set()
+
+        with pytest.raises(PopbillError):
+            await first
+        assert popbill_client._query_locks[key] is newer
+
+    @pytest.mark.asyncio
+    async def test_popbill_cached_query_returns_copy(self, popbill_client):
+        """Test mutating a query result does not change the cached response."""
+        popbill_client._request = AsyncMock(return_value={"total": 1, "list": [{"ntsconfirmNum": "A"}]})
+
+        first = await popbill_client.search_tax_invoices("1234567890", "SELL", "20240101", "20240131")
+        first["list"].clear()
+        second = await popbill_client.search_tax_invoices("1234567890", "SELL", "20240101", "20240131")
+
+        assert second["list"] == [{"ntsconfirmNum": "A"}]
+        popbill_client._request.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_popbill_issue_invalidates_search_and_balance(self, popbill_client):
+        """Test issuing drops the company's cached search results and balance."""
+        from providers.popbill import PopbillTaxInvoice
+
+        popbill_client._request = AsyncMock(return_value={"balance": 100, "list": []})
+        await popbill_client.get_balance("1234567890")
+        await popbill_client.search_tax_invoices("1234567890", "SELL", "20240101", "20240131")
+        await popbill_client.get_balance("0987654321")
+
+        popbill_client._request.return_value = {"invoiceNumber": "TEST-001"}
+        await popbill_client.issue_tax_invoice(
+            corp_num="1234567890",
+            invoice=PopbillTaxInvoice(
+                invoice_number="TEST-001",
+                write_date="20240115",
+                invoicer_corp_num="1234567890",
+                invoicer_corp_name="Test Company",
+                invoicer_ceo_name="Test CEO",
+            ),
+        )
+
+        assert [key[0] for key in popbill_client._query_cache] == ["/Taxinvoice/0987654321/Balance"]
+
+    @pytest.mark.asyncio
+    async def test_popbill_query_cache_short_for_pending_invoices(self, popbill_client):
+        """Test invoices awaiting NTS results are cached only briefly."""
+        from providers import popbill as popbill_module
+
+        popbill_client._request = AsyncMock(return_value={"stateCode": 300})
+
+        await popbill_client.query_tax_invoice("1234567890", "INV-1")
+
+        expires_at, _ = popbill_client._query_cache["/Taxinvoice/1234567890/INV-1", None]
+        remaining = expires_at - time.monotonic()
+        assert remaining <= popbill_module._QUERY_CACHE_PENDING_TTL
+
+    @pytest.mark.asyncio
+    async def test_popbill_request_retries_throttling_with_backoff(self, popbill_client):
+        """Test 429 responses are retried, honoring Retry-After."""
+        throttled = MagicMock(
+            status_code=429,
+            content=b'{"code": -99999999, "message": "Too many requests"}',
+            headers={"Retry-After": "7"},
+        )
+        ok = MagicMock(status_code=200, content=b'{"balance": 10}')
+        popbill_client._get_access_token = AsyncMock(return_value="TOKEN")
+        popbill_client._client.get = AsyncMock(side_effect=[throttled, ok])
+
+        with patch("providers.popbill.asyncio.sleep", new=AsyncMock()) as sleep:
+            result = await popbill_client._request("GET", "/Taxinvoice/1234567890/Balance", "1234567890")
+
+        assert result == {"balance": 10}
+        sleep.assert_awaited_once()
+        assert sleep.await_args.args[0] >= 7
+
+    @pytest.mark.parametrize("retry_after", ["86400", "inf"])
+    @pytest.mark.asyncio
+    async def test_popbill_long_retry_after_fails_fast(self, popbill_client, retry_after):
+        """Test a Retry-After beyond max_retry_wait raises instead of sleeping."""
+        from providers.popbill import PopbillError
+
+        throttled = MagicMock(
+            status_code=429,
+            content=b'{"code": -99999999, "message": "Too many requests"}',
+            headers={"Retry-After": retry_after},
+        )
+        popbill_client._get_access_token = AsyncMock(return_value="TOKEN")
+        popbill_client._client.get = AsyncMock(return_value=throttled)
+
+        with patch("providers.popbill.asyncio.sleep", new=AsyncMock()) as sleep:
+            with pytest.raises(PopbillError) as exc_info:
+                await popbill_client._request("GET", "/Taxinvoice/1234567890/Balance", "1234567890")
+
+        assert exc_info.value.code == "-99999999"
+        sleep.assert_not_awaited()
+        popbill_client._client.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_popbill_nan_retry_after_uses_backoff(self, popbill_client):
+        """Test a non-numeric Retry-After falls back to the backoff delay."""
+        with patch("providers.popbill.asyncio.sleep", new=AsyncMock()) as sleep:
+            assert await popbill_client._sleep_for_retry(0, "nan")
+
+        assert sleep.await_args.args[0] <= popbill_client.config.retry_delay + 0.25
+
+    @pytest.mark.asyncio
+    async def test_popbill_retry_backoff_is_exponential(self, popbill_client):
+        """Test retry delay doubles per attempt plus bounded jitter."""
+        with patch("providers.popbill.asyncio.sleep", new=AsyncMock()) as sleep:
+            for attempt in range(3):
+                await popbill_client._sleep_for_retry(attempt)
+
+        delays = [call.args[0] for call in sleep.await_args_list]
+        for attempt, delay in enumerate(delays):
+            base = popbill_client.config.retry_delay * 2**attempt
+            assert base <= delay <= base + 0.25
+
     @pytest.mark.asyncio
     async def test_popbill_client_query_invoice(self, popbill_client):
         """Test invoice query with mocked API."""
@@ -484,6 +822,16 @@ class TestSEEDCipher:
 
         assert decrypted == text
 
+    @pytest.mark.parametrize("encoding", ["utf-8", "euc-kr"])
+    def test_seed_cipher_encrypt_string_korean(self, seed_cipher, encoding):
+        """Test non-ASCII text roundtrips in Korean encodings."""
+        text = "세금계산서 2024-001"
+
+        ciphertext = seed_cipher.encrypt_string(text, encoding)
+
+        assert seed_cipher.decrypt(ciphertext) == text.encode(encoding)
+        assert seed_cipher.decrypt_string(ciphertext, encoding) == text
+
     def test_seed_cipher_decrypt_invalid_length(self, seed_cipher):
         """Test decryption with invalid ciphertext length."""
         with pytest.raises(ValueError):
@@ -511,6 +859,13 @@ class TestSEEDCipher:
         key2, _ = derive_key_from_password("test_password", salt)
         assert key == key2
 
+    def test_derive_key_rejects_non_latin1_password(self):
+        """Test passwords outside latin-1 are rejected rather than re-encoded."""
+        from src.crypto.seed import derive_key_from_password
+
+        with pytest.raises(UnicodeEncodeError):
+            derive_key_from_password("한", b"\x00" * 16)
+
 
 class TestTaxInvoiceService:
     """Tests for TaxInvoiceService."""
@@ -546,6 +901,80 @@ class TestTaxInvoiceService:
         assert not result["success"]
         assert "before" in result["error_message"].lower()
 
+    @pytest.mark.asyncio
+    async def test_iter_invoices_yields_batches(self, tax_service):
+        """Test streamed invoices are split into batches of batch_size."""
+        tax_service._scraper = MagicMock(get_tax_invoices=AsyncMock(return_value=list(range(5))))
+        tax_service._invoice_to_dict = lambda inv: {"invoice_number": str(inv)}
+
+        batches = [
+            batch
+            async for batch in tax_service.iter_tax_invoices(
+                session_id="test-session",
+                start_date="2024-01-01",
+                end_date="2024-01-31",
+                batch_size=2,
+            )
+        ]
+
+        assert [len(b["invoices"]) for b in batches] == [2, 2, 1]
+        assert [b["page"] for b in batches] == [1, 2, 3]
+        assert all(b["success"] and b["total_count"] == 5 for b in batches)
+        tax_service._scraper.get_tax_invoices.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_iter_invoices_invalid_date_range(self, tax_service):
+        """Test a failed streamed search yields a single error result."""
+        batches = [
+            batch
+            async for batch in tax_service.iter_tax_invoices(
+                session_id="test-session",
+                start_date="2024-01-15",
+                end_date="2024-01-10",
+            )
+        ]
+
+        assert len(batches) == 1
+        assert batches[0]["error_code"] == "INVALID_DATE_RANGE"
+
+    @pytest.mark.asyncio
+    async def test_iter_invoices_rejects_non_positive_batch_size(self, tax_service):
+        """Test a non-positive batch size fails instead of yielding nothing."""
+        tax_service._scraper = MagicMock(get_tax_invoices=AsyncMock(return_value=list(range(5))))
+
+        batches = [
+            batch
+            async for batch in tax_service.iter_tax_invoices(
+                session_id="test-session",
+                start_date="2024-01-01",
+                end_date="2024-01-31",
+                batch_size=-1,
+            )
+        ]
+
+        assert len(batches) == 1
+        assert batches[0]["error_code"] == "INVALID_BATCH_SIZE"
+        tax_service._scraper.get_tax_invoices.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_session_indexed_by_id(self, tax_service):
+        """Test sessions resolve to their company by ID until logout."""
+        session = MagicMock(session_id="sid-1", expires_at=datetime.now(), company_name="Test")
+        tax_service._scraper = MagicMock(
+            login=AsyncMock(return_value=session), logout=AsyncMock()
+        )
+
+        await tax_service.login(
+            company_id="test-company",
+            business_number="1234567891",
+            auth_type="certificate",
+        )
+        assert tax_service.get_session_company("sid-1") == "test-company"
+
+        await tax_service.logout("sid-1")
+        assert tax_service.get_session_company("sid-1") is None
+        assert "sid-1" not in tax_service._sessions
+
     @pytest.mark.asyncio
     async def test_service_close(self, tax_service):
         """Test service cleanup."""
@@ -579,6 +1008,14 @@ class TestHometaxConstants:
             assert selector in SELECTORS
             assert SELECTORS[selector]  # Not empty
 
+    def test_lookup_tables_read_only(self):
+        """Test shared lookup tables cannot be mutated."""
+        from src.hometax.constants import SELECTORS, STATUS_MAP, TAX_TYPE_MAP
+
+        for table in (SELECTORS, STATUS_MAP, TAX_TYPE_MAP):
+            with pytest.raises(TypeError):
+                table["new_key"] = "value"
+
     def test_timeouts_defined(self):
         """Test timeout values are defined."""
         from src.hometax.constants import TIMEOUTS
@@ -586,3 +1023,602 @@ class TestHometaxConstants:
         assert TIMEOUTS["page_load"] > 0
         assert TIMEOUTS["navigation"] > 0
         assert TIMEOUTS["element_wait"] > 0
+
+
+class TestHometaxPages:
+    """Tests for Hometax page objects with a mocked Playwright page."""
+
+    @pytest.mark.asyncio
+    async def test_search_results_extracted_in_one_call(self):
+        """Test the result table is read with one page.evaluate and bad rows skipped."""
+        from src.hometax.models import InvoiceStatus
+        from src.hometax.pages.search import TaxInvoiceSearchPage
+
+        page = MagicMock()
+        page.wait_for_selector = AsyncMock()
+        page.evaluate = AsyncMock(
+            return_value=[
+                [
+                    "20240115-001", "2024-01-15", "123-45-67890", "Supplier",
+                    "098-76-54321", "Buyer", "1,000,000", "100,000", "02", "NTS-1",
+                ],
+                ["", "bad row"],
+                [
+                    "20240115-002", "2024-01-15", "123-45-678", "Short BRN",
+                    "098-76-54321", "Buyer", "1,000", "100", "02", "",
+                ],
+            ]
+        )
+
+        invoices = await TaxInvoiceSearchPage(page)._parse_search_results()
+
+        page.evaluate.assert_awaited_once()
+        assert len(invoices) == 1
+        assert invoices[0].supplier_business_number == "1234567890"
+        assert invoices[0].total_amount == Decimal("1100000")
+        assert invoices[0].nts_confirm_number == "NTS-1"
+        assert invoices[0].status is InvoiceStatus.ISSUED
+
+    @pytest.mark.asyncio
+    async def test_invoice_detail_cached(self):
+        """Test repeated detail lookups are served from the LRU cache."""
+        from src.hometax.pages.search import TaxInvoiceSearchPage
+
+        page = MagicMock()
+        page.query_selector = AsyncMock(return_value=None)
+        search_page = TaxInvoiceSearchPage(page, max_cache=1)
+        search_page._parse_detail_page = AsyncMock(side_effect=lambda: MagicMock())
+
+        first = await search_page.get_invoice_detail("INV-1")
+        assert await search_page.get_invoice_detail("INV-1") is first
+        assert search_page._parse_detail_page.await_count == 1
+
+        await search_page.get_invoice_detail("INV-2")  # Evicts INV-1
+        await search_page.get_invoice_detail("INV-1")
+        assert search_page._parse_detail_page.await_count == 3
+
+        search_page.set_cache_size(0)
+        await search_page.get_invoice_detail("INV-1")
+        assert search_page._parse_detail_page.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_invoice_detail_cache_expires_and_invalidates(self):
+        """Test stale or invalidated details are parsed again."""
+        from src.hometax.pages.search import TaxInvoiceSearchPage
+
+        page = MagicMock()
+        page.query_selector = AsyncMock(return_value=None)
+        search_page = TaxInvoiceSearchPage(page, cache_ttl=60)
+        search_page._parse_detail_page = AsyncMock(side_effect=lambda: MagicMock())
+
+        await search_page.get_invoice_detail("INV-1")
+        search_page.invalidate("INV-1")
+        await search_page.get_invoice_detail("INV-1")
+        assert search_page._parse_detail_page.await_count == 2
+
+        parsed_at, invoice = search_page._detail_cache["INV-1"]
+        search_page._detail_cache["INV-1"] = (parsed_at - 61, invoice)
+        assert await search_page.get_invoice_detail("INV-1") is not invoice
+        assert search_page._parse_detail_page.await_count == 3
+
+        search_page.invalidate()
+        assert not search_page._detail_cache
+
+    @pytest.mark.asyncio
+    async def test_fill_items_adds_rows_then_fills_once(self):
+        """Test item rows are added and filled with one evaluate each."""
+        from src.hometax.models import TaxInvoiceItem
+        from src.hometax.pages.issue import TaxInvoiceIssuePage
+
+        page = MagicMock()
+        page.evaluate = AsyncMock()
+        page.wait_for_function = AsyncMock()
+        items = [
+            TaxInvoiceItem(description=f"Item {i}", unit_price=100, amount=100, tax_amount=10)
+            for i in range(3)
+        ]
+
+        await TaxInvoiceIssuePage(page)._fill_items(items)
+
+        add_rows, fill = page.evaluate.await_args_list
+        assert add_rows.args[1] == 2
+        assert page.wait_for_function.await_args.kwargs["arg"] == "#item_2_itemName"
+        assert fill.args[1]["#item_2_itemName"] == "Item 2"
+
+    @pytest.mark.asyncio
+    async def test_login_state_cached_until_navigation_or_logout(self):
+        """Test is_logged_in reuses a recent confirmation until navigation or logout."""
+        from src.hometax.pages.login import LoginPage
+
+        page = MagicMock()
+        page.query_selector = AsyncMock(return_value=MagicMock())
+        login_page = LoginPage(page)
+
+        assert await login_page.is_logged_in()
+        assert await login_page.is_logged_in()
+        assert page.query_selector.await_count == 1
+
+        # Any main-frame navigation drops the confirmation
+        on_navigated = page.on.call_args.args[1]
+        on_navigated(page.main_frame)
+        assert await login_page.is_logged_in()
+        assert page.query_selector.await_count == 2
+
+        page.query_selector = AsyncMock(return_value=None)
+        page.wait_for_selector = AsyncMock()
+        page.wait_for_function = AsyncMock()
+        await login_page.logout()
+
+        assert not await login_page.is_logged_in()
+
+    def test_date_helpers(self):
+        """Test the strftime/strptime-free date helpers."""
+        from src.hometax.pages.common import yyyymmdd
+        from src.hometax.pages.search import _parse_dashed_date
+
+        assert yyyymmdd(date(2024, 1, 5)) == "20240105"
+        assert _parse_dashed_date("2024-01-05") == datetime(2024, 1, 5)
+
+        for value in ("2024/01/05", "20240105", "2024-13-01"):
+            with pytest.raises(ValueError):
+                _parse_dashed_date(value)
+
+
+class TestContextPool:
+    """Tests for the pre-warmed browser context pool."""
+
+    @staticmethod
+    def _make_context():
+        context = MagicMock()
+        context.browser = None
+        context.close = AsyncMock()
+        return context
+
+    @pytest.mark.asyncio
+    async def test_released_context_replaced_not_reused(self):
+        """Test a released context is closed and never handed out again."""
+        from src.hometax.context_pool import ContextPool
+
+        factory = AsyncMock(side_effect=lambda: self._make_context())
+        pool = ContextPool(factory, size=2)
+        await pool.start()
+
+        # Storage of the first login (localStorage, IndexedDB) lives in the context
+        context = await pool.acquire()
+        await pool.release(context)
+        await pool._refill_task
+
+        context.close.assert_awaited_once()
+        assert factory.await_count == 3
+        assert pool.idle_count == 2
+        handed_out = [await pool.acquire(), await pool.acquire()]
+        assert context not in handed_out
+
+    @pytest.mark.asyncio
+    async def test_surplus_contexts_closed(self):
+        """Test contexts beyond the pool size are created and closed on demand."""
+        from src.hometax.context_pool import ContextPool
+
+        pool = ContextPool(AsyncMock(side_effect=lambda: self._make_context()), size=1)
+        first = await pool.acquire()
+        second = await pool.acquire()
+
+        await pool.release(first)
+        await pool.release(second)
+        await pool._refill_task
+
+        first.close.assert_awaited_once()
+        second.close.assert_awaited_once()
+        assert pool.idle_count == 1
+
+
+class TestHometaxScraper:
+    """Tests for HometaxScraper session handling."""
+
+    @pytest.mark.asyncio
+    async def test_session_context_rotated_when_old(self):
+        """Test worn session contexts are replaced, keeping storage state."""
+        from src.hometax.scraper import _MAX_CONTEXT_AGE, HometaxScraper, _SessionContext
+
+        old = MagicMock(pages=[], storage_state=AsyncMock(return_value={"cookies": []}))
+        old.close = AsyncMock()
+        new = MagicMock(pages=[MagicMock()])
+
+        scraper = HometaxScraper()
+        scraper._create_context = AsyncMock(return_value=new)
+        scraper._sessions["sid"] = _SessionContext(old, created_at=0.0, pooled=False)
+
+        with patch("src.hometax.scraper.time.monotonic", return_value=_MAX_CONTEXT_AGE + 1):
+            async with scraper._session_page("sid") as page:
+                assert page is new.pages[0]
+
+        scraper._create_context.assert_awaited_once_with(storage_state={"cookies": []})
+        old.close.assert_awaited_once()
+        assert scraper._sessions["sid"].context is new
+
+    @pytest.mark.asyncio
+    async def test_rotated_pooled_context_refills_pool(self):
+        """Test rotating a pooled session context returns its slot to the pool."""
+        from src.hometax.context_pool import ContextPool
+        from src.hometax.scraper import _MAX_OPS_PER_CONTEXT, HometaxScraper, _SessionContext
+
+        factory = AsyncMock(side_effect=lambda: TestContextPool._make_context())
+        scraper = HometaxScraper()
+        scraper._context_pool = ContextPool(factory, size=1)
+        await scraper._context_pool.start()
+        scraper._create_context = AsyncMock(return_value=MagicMock(pages=[MagicMock()]))
+
+        old = await scraper._context_pool.acquire()
+        old.pages = [MagicMock()]
+        old.storage_state = AsyncMock(return_value={})
+        scraper._sessions["sid"] = _SessionContext(old, op_count=_MAX_OPS_PER_CONTEXT)
+        assert scraper._context_pool.idle_count == 0
+
+        async with scraper._session_page("sid"):
+            pass
+        await scraper._context_pool._refill_task
+
+        old.close.assert_awaited_once()
+        assert scraper._context_pool.idle_count == 1
+        assert scraper._sessions["sid"].pooled is False
+
+    @pytest.mark.asyncio
+    async def test_session_page_kept_between_calls(self):
+        """Test a session reuses its page and only replaces it once closed."""
+        from src.hometax.scraper import HometaxScraper, _SessionContext
+
+        page = MagicMock(is_closed=MagicMock(return_value=False))
+        replacement = MagicMock()
+        context = MagicMock(pages=[], new_page=AsyncMock(return_value=replacement))
+
+        scraper = HometaxScraper()
+        scraper._sessions["sid"] = _SessionContext(context, page=page)
+
+        for _ in range(2):
+            async with scraper._session_page("sid") as current:
+                assert current is page
+        context.new_page.assert_not_awaited()
+
+        page.is_closed.return_value = True
+        async with scraper._session_page("sid") as current:
+            assert current is replacement
+        assert scraper._sessions["sid"].page is replacement
+
+    @pytest.mark.asyncio
+    async def test_session_operations_serialized_across_rotation(self):
+        """Test a rotation waits for the operation using the old context."""
+        from src.hometax.scraper import _MAX_OPS_PER_CONTEXT, HometaxScraper, _SessionContext
+
+        old = MagicMock(pages=[MagicMock()], storage_state=AsyncMock(return_value={}))
+        old.close = AsyncMock()
+        new = MagicMock(pages=[MagicMock()])
+
+        scraper = HometaxScraper()
+        scraper._create_context = AsyncMock(return_value=new)
+        scraper._sessions["sid"] = _SessionContext(
+            old, op_count=_MAX_OPS_PER_CONTEXT - 1, pooled=False
+        )
+
+        async def rotating_operation():
+            async with scraper._session_page("sid") as page:
+                return page
+
+        async with scraper._session_page("sid") as page:
+            assert page is old.pages[0]
+            waiting = asyncio.create_task(rotating_operation())
+            await asyncio.sleep(0)
+            old.close.assert_not_awaited()
+
+        assert await waiting is new.pages[0]
+        old.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_identical_invoice_queries_share_one_scrape(self):
+        """Test concurrent identical queries share one in-flight scrape."""
+        from src.hometax.scraper import HometaxScraper
+
+        release = asyncio.Event()
+        invoices = [MagicMock()]
+
+        async def fetch(*args):
+            await release.wait()
+            return invoices
+
+        scraper = HometaxScraper()
+        scraper._fetch_tax_invoices = AsyncMock(side_effect=fetch)
+
+        tasks = [
+            asyncio.create_task(scraper.get_tax_invoices("sid", "2024-01-01", "2024-01-31"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert all(r == invoices for r in results)
+        scraper._fetch_tax_invoices.assert_awaited_once()
+
+        # A finished query is not reused; the next call scrapes again
+        assert await scraper.get_tax_invoices("sid", "2024-01-01", "2024-01-31") == invoices
+        assert scraper._fetch_tax_invoices.await_count == 2
+        assert not scraper._inflight
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_abort_shared_query(self):
+        """Test cancelling the first caller leaves the shared scrape running."""
+        from src.hometax.scraper import HometaxScraper
+
+        release = asyncio.Event()
+        invoices = [MagicMock()]
+
+        async def fetch(*args):
+            await release.wait()
+            return invoices
+
+        scraper = HometaxScraper()
+        scraper._fetch_tax_invoices = AsyncMock(side_effect=fetch)
+
+        first = asyncio.create_task(scraper.get_tax_invoices("sid", "2024-01-01", "2024-01-31"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(scraper.get_tax_invoices("sid", "2024-01-01", "2024-01-31"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == invoices
+        assert first.cancelled()
+        scraper._fetch_tax_invoices.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_close_stops_scrapes_before_closing_sessions(self):
+        """Test close() awaits cancelled scrapes, then closes sessions under their lock."""
+        from src.hometax.scraper import HometaxScraper, _SessionContext
+
+        order = []
+        started = asyncio.Event()
+
+        async def fetch(*args):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            finally:
+                order.append("scrape_stopped")
+
+        context = MagicMock()
+        context.close = AsyncMock(side_effect=lambda: order.append("context_closed"))
+        scraper = HometaxScraper()
+        scraper._fetch_tax_invoices = AsyncMock(side_effect=fetch)
+        scraper._sessions["sid"] = _SessionContext(context, pooled=False)
+
+        query = asyncio.create_task(scraper.get_tax_invoices("sid", "2024-01-01", "2024-01-31"))
+        await started.wait()
+        await scraper.close()
+
+        assert order == ["scrape_stopped", "context_closed"]
+        assert not scraper._sessions
+        with pytest.raises(asyncio.CancelledError):
+            await query
+
+    @pytest.mark.asyncio
+    async def test_failed_invoice_query_not_cached(self):
+        """Test a failed query raises for its waiters and is retried next time."""
+        from src.hometax.scraper import HometaxScraper
+
+        scraper = HometaxScraper()
+        scraper._fetch_tax_invoices = AsyncMock(side_effect=[RuntimeError("boom"), []])
+
+        with pytest.raises(RuntimeError):
+            await scraper.get_tax_invoices("sid", "2024-01-01", "2024-01-31")
+        assert await scraper.get_tax_invoices("sid", "2024-01-01", "2024-01-31") == []
+        assert scraper._fetch_tax_invoices.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_login_restores_cached_storage_state(self):
+        """Test a repeat login with the same credentials reuses the snapshot."""
+        import time
+
+        from src.hometax.scraper import HometaxScraper
+
+        restored = MagicMock(pages=[])
+        restored.new_page = AsyncMock(return_value=MagicMock(goto=AsyncMock()))
+
+        scraper = HometaxScraper()
+        scraper._create_context = AsyncMock(return_value=restored)
+        scraper._context_pool.acquire = AsyncMock()
+        key = scraper._storage_state_key("1234567890", "id_password", None, "user", "pw")
+        scraper._storage_states[key] = (time.monotonic(), {"cookies": []})
+
+        with patch("src.hometax.scraper.LoginPage.is_logged_in", new=AsyncMock(return_value=True)):
+            session = await scraper.login(
+                "1234567890", "id_password", user_id="user", password="pw"
+            )
+
+        scraper._context_pool.acquire.assert_not_awaited()
+        assert scraper._sessions[session.session_id].context is restored
+        assert scraper._sessions[session.session_id].pooled is False
+
+        # Different credentials never see the snapshot
+        other = scraper._storage_state_key("1234567890", "id_password", None, "user", "other")
+        assert await scraper._restore_login(other) is None
+
+    @pytest.mark.asyncio
+    async def test_expired_storage_states_pruned_on_login(self):
+        """Test a full login drops expired snapshots of other credentials."""
+        import time
+
+        from src.hometax.scraper import _STORAGE_STATE_TTL, HometaxScraper
+
+        context = MagicMock(pages=[MagicMock(goto=AsyncMock())])
+        context.storage_state = AsyncMock(return_value={"cookies": []})
+
+        scraper = HometaxScraper()
+        scraper._context_pool.acquire = AsyncMock(return_value=context)
+        scraper._login_with_credentials = AsyncMock()
+        scraper._get_company_name = AsyncMock(return_value="Test")
+        expired = scraper._storage_state_key("0987654321", "id_password", None, "old", "pw")
+        scraper._storage_states[expired] = (time.monotonic() - _STORAGE_STATE_TTL - 1, {})
+
+        await scraper.login("1234567890", "id_password", user_id="user", password="pw")
+
+        key = scraper._storage_state_key("1234567890", "id_password", None, "user", "pw")
+        assert list(scraper._storage_states) == [key]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("resource_type", "url", "blocked"),
+        [
+            ("image", "https://www.hometax.go.kr/img/banner.png", True),
+            ("font", "https://www.hometax.go.kr/font/nanum.woff2", True),
+            ("script", "https://www.hometax.go.kr/js/analytics.js", True),
+            ("script", "https://www.hometax.go.kr/websquare/websquare.js", False),
+            ("stylesheet", "https://www.hometax.go.kr/css/common.css", False),
+            ("xhr", "https://www.hometax.go.kr/wqAction.do", False),
+        ],
+    )
+    async def test_unneeded_resources_blocked(self, resource_type, url, blocked):
+        """Test heavy and analytics requests are aborted, page logic is not."""
+        from src.hometax.scraper import block_unneeded_resources
+
+        route = MagicMock(abort=AsyncMock(), continue_=AsyncMock())
+        route.request.resource_type = resource_type
+        route.request.url = url
+
+        await block_unneeded_resources(route)
+
+        assert route.abort.await_count == int(blocked)
+        assert route.continue_.await_count == int(not blocked)
+
+    @pytest.mark.asyncio
+    async def test_resource_blocking_scoped_to_hometax(self):
+        """Test the blocking route is registered for Hometax URLs only."""
+        from src.hometax.constants import HOMETAX_URL_PATTERN
+        from src.hometax.scraper import HometaxScraper, block_unneeded_resources
+
+        context = MagicMock(route=AsyncMock())
+        scraper = HometaxScraper()
+        scraper._get_browser = AsyncMock(
+            return_value=MagicMock(new_context=AsyncMock(return_value=context))
+        )
+
+        await scraper._create_context()
+
+        context.route.assert_awaited_once_with(HOMETAX_URL_PATTERN, block_unneeded_resources)
+        assert HOMETAX_URL_PATTERN.match("https://www.hometax.go.kr/img/banner.png")
+        assert HOMETAX_URL_PATTERN.match("https://teht.hometax.go.kr/wqAction.do")
+        assert not HOMETAX_URL_PATTERN.match("https://www.google-analytics.com/analytics.js")
+        assert not HOMETAX_URL_PATTERN.match("https://cert.example.com/?next=hometax.go.kr/")
+
+
+class TestNotificationHub:
+    """Tests for invoice notification fan-out."""
+
+    def test_notifications_delivered_to_company_subscribers(self):
+        """Test a message reaches every stream of its company and no other."""
+        from src.services.notifications import CHANNEL_PREFIX, NotificationHub
+
+        hub = NotificationHub("redis://localhost:6379/0")
+        first = hub.subscribe("company-1")
+        second = hub.subscribe("company-1")
+        other = hub.subscribe("company-2")
+
+        hub._deliver(f"{CHANNEL_PREFIX}company-1", b'{"invoice_number": "INV-1"}')
+
+        assert first.get_nowait() == {"invoice_number": "INV-1"}
+        assert second.get_nowait() == {"invoice_number": "INV-1"}
+        assert other.empty()
+
+        hub.unsubscribe("company-1", first)
+        hub.unsubscribe("company-1", second)
+        assert "company-1" not in hub._queues
+
+    def test_slow_subscriber_drops_oldest(self):
+        """Test a full queue keeps the newest notifications."""
+        from src.services.notifications import CHANNEL_PREFIX, NotificationHub
+
+        hub = NotificationHub("redis://localhost:6379/0", queue_size=2)
+        queue = hub.subscribe("company-1")
+
+        for n in range(3):
+            hub._deliver(f"{CHANNEL_PREFIX}company-1", f'{{"n": {n}}}'.encode())
+
+        assert [queue.get_nowait()["n"] for _ in range(2)] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_lost_subscription_ends_streams_and_resubscribes(self):
+        """Test a Redis failure disconnects open streams and the hub recovers."""
+        from src.services import notifications
+        from src.services.notifications import DISCONNECTED, NotificationHub
+
+        async def failing_listen():
+            raise ConnectionError("connection reset")
+            yield
+
+        async def idle_listen():
+            await asyncio.Event().wait()
+            yield
+
+        lost = MagicMock(psubscribe=AsyncMock(), listen=failing_listen, aclose=AsyncMock())
+        restored = MagicMock(psubscribe=AsyncMock(), listen=idle_listen, aclose=AsyncMock())
+
+        hub = NotificationHub("redis://localhost:6379/0")
+        hub._redis = MagicMock(pubsub=MagicMock(side_effect=[lost, restored]), aclose=AsyncMock())
+        queue = hub.subscribe("company-1")
+
+        with patch.object(notifications, "_RECONNECT_DELAY", 0):
+            await hub.start()
+            assert await asyncio.wait_for(queue.get(), 1) is DISCONNECTED
+            while not hub.running:
+                await asyncio.sleep(0)
+
+        restored.psubscribe.assert_awaited_once()
+        lost.aclose.assert_awaited_once()
+        await hub.close()
+        assert not hub.running
+
+
+class TestSettings:
+    """Tests for lazily loaded service settings."""
+
+    @pytest.fixture(autouse=True)
+    def reset_settings(self, monkeypatch):
+        """Start each test without a loaded settings instance."""
+        from config import settings as settings_module
+
+        monkeypatch.setattr(settings_module, "_settings", None)
+        return settings_module
+
+    def test_settings_loaded_on_first_call(self, reset_settings, monkeypatch):
+        """Test env is read when get_settings() is first called, not at import."""
+        monkeypatch.setenv("GRPC_PORT", "50099")
+
+        settings = reset_settings.get_settings()
+
+        assert settings.grpc_port == 50099
+        assert settings.grpc_address.endswith(":50099")
+
+    def test_settings_singleton(self, reset_settings):
+        """Test repeated calls return the same instance."""
+        assert reset_settings.get_settings() is reset_settings.get_settings()
+
+    def test_legacy_headless_env_name(self, reset_settings, monkeypatch):
+        """Test PLAYWRIGHT_HEADLESS still configures browser_headless."""
+        monkeypatch.setenv("PLAYWRIGHT_HEADLESS", "false")
+
+        settings = reset_settings.get_settings()
+
+        assert settings.browser_headless is False
+        assert settings.playwright_headless is False
+
+    def test_context_pool_size_default(self, reset_settings, monkeypatch):
+        """Test the pool size defaults to a small fixed value."""
+        monkeypatch.delenv("BROWSER_CONTEXT_POOL_SIZE", raising=False)
+
+        assert reset_settings.get_settings().browser_context_pool_size == 4
+
+    def test_context_pool_size_from_env(self, reset_settings, monkeypatch):
+        """Test BROWSER_CONTEXT_POOL_SIZE overrides the default."""
+        monkeypatch.setenv("BROWSER_CONTEXT_POOL_SIZE", "2")
+
+        assert reset_settings.get_settings().browser_context_pool_size == 2